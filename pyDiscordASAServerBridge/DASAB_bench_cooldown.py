@@ -0,0 +1,41 @@
+"""Synthetic load for CooldownManager: python DASAB_bench_cooldown.py [users] [rounds]"""
+import random
+import sys
+import time
+import tracemalloc
+
+from utils import CooldownManager
+
+COMMAND_KEYS = ("server_start:arkserverbridge", "server_stop", "server_restart", "server_list", "send_command:admin")
+
+
+def run(users: int = 1_000_000, rounds: int = 3, seed: int = 1):
+    rng = random.Random(seed)
+    manager = CooldownManager()
+    now = 0.0
+    tracemalloc.start()
+    for round_no in range(rounds):
+        started = time.perf_counter()
+        for user_id in range(users):
+            command_key = COMMAND_KEYS[user_id % len(COMMAND_KEYS)]
+            now += 0.0005
+            if manager.get_remaining(user_id, command_key, now) > 0:
+                continue
+            manager.set_cooldown(user_id, command_key, rng.choice((1.0, 10.0, 60.0, 3600.0)), now)
+        elapsed = time.perf_counter() - started
+        current, peak = tracemalloc.get_traced_memory()
+        print(
+            f"round {round_no + 1}: {users} users in {elapsed:.2f}s "
+            f"({elapsed / users * 1e6:.2f} us/op) {manager.stats()} "
+            f"mem={current / 1e6:.1f}MB peak={peak / 1e6:.1f}MB"
+        )
+    # Let every cooldown lapse; the store must drain back to empty.
+    now += 3600.0
+    started = time.perf_counter()
+    manager.evict_expired(now, limit=0)
+    print(f"drain: {time.perf_counter() - started:.2f}s {manager.stats()}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run(*args)
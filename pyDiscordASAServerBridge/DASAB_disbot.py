@@ -9,7 +9,7 @@ import asyncio
 import inspect
 import re
 
-from utils import CommandConfigs, CooldownManager, load_json_file_with_comments
+from utils import CommandConfigs, CommandRateLimiter, CooldownManager, load_json_file_with_comments
 from DASAB_server_Info_manager import DASAB_SERVER_INFO_MANAGER
 dasab_server_info = DASAB_SERVER_INFO_MANAGER()
 
@@ -28,6 +28,7 @@ req_serv_update_cfg = None
 rconcmd_cfg = None
 runtime_command_configs = {}
 SLASH_OPTION_NAME_PATTERN = re.compile(r"^[a-z0-9_-]{1,32}$")
+MATCHED_CONTROL_EXTRA = "dasab_matched_control"
 
 
 def _get_config_by_name(source_cmd_list: CommandConfigs, command_name: str):
@@ -119,8 +120,6 @@ def _reload_command_configs_from_disk() -> int:
 
 _apply_command_configs(CommandConfigs())
 
-SERVER_LIST_REFRESH_INTERVAL_SECONDS = 180
-
 dasab_log_handler = logging.FileHandler(filename='DASAB_logs.log', encoding='utf-8', mode='w')
 
 intents = discord.Intents.default()
@@ -139,6 +138,15 @@ class DASABot(discord.Client):
         else:
             await self.tree.sync()
 
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            await dasab_server_info.aclose()
+            cooldown_manager.close()
+            print(f"Command limits: {rate_limiter.stats()}")
+            print(f"Backend admission: {dasab_server_info.admission_stats()}")
+
 dasab_bot = DASABot()
 
 @dasab_bot.event
@@ -146,7 +154,7 @@ async def on_ready() -> None:
     print(f"Logged in as {dasab_bot.user} (id={dasab_bot.user.id})")
     if not hasattr(dasab_bot, "_server_list_refresh_task") or dasab_bot._server_list_refresh_task.done():
         dasab_bot._server_list_refresh_task = asyncio.create_task(
-            dasab_server_info.run_cache_refresh_loop(SERVER_LIST_REFRESH_INTERVAL_SECONDS)
+            dasab_server_info.run_cache_refresh_loop()
         )
 
 def slash_command(config=None, *args, **kwargs):
@@ -188,23 +196,8 @@ def slash_command(config=None, *args, **kwargs):
 
     return wrapper
 
-cooldown_manager = CooldownManager()
-
-def _role_matches_control(interaction: discord.Interaction, control) -> bool:
-    required_role = str(getattr(control, "_role", "") or "").strip()
-    if not required_role:
-        return True
-    member_roles = getattr(interaction.user, "roles", None)
-    if not member_roles:
-        return False
-
-    if required_role.isdigit():
-        role_id = int(required_role)
-        return any(getattr(role, "id", None) == role_id for role in member_roles)
-
-    required_name = required_role.casefold()
-    return any(str(getattr(role, "name", "")).casefold() == required_name for role in member_roles)
-
+cooldown_manager = CooldownManager.from_env()
+rate_limiter = CommandRateLimiter()
 
 def _get_reload_allowed_roles() -> list[str]:
     raw_value = os.getenv(RELOAD_ALLOWED_ROLES_ENV, "ArkServerBridgeAdmin")
@@ -231,15 +224,6 @@ def _has_reload_access(interaction: discord.Interaction) -> bool:
             return True
     return False
 
-def _scope_allows_control(interaction: discord.Interaction, control) -> bool:
-    allowed_guilds = getattr(control, "_allowed_guild_ids_list", [])
-    allowed_channels = getattr(control, "_allowed_channel_ids_list", [])
-    if allowed_guilds and interaction.guild_id not in allowed_guilds:
-        return False
-    if allowed_channels and interaction.channel_id not in allowed_channels:
-        return False
-    return True
-
 def _scope_denied_message(interaction: discord.Interaction, control) -> str:
     allowed_guilds = getattr(control, "_allowed_guild_ids_list", [])
     allowed_channels = getattr(control, "_allowed_channel_ids_list", [])
@@ -249,35 +233,21 @@ def _scope_denied_message(interaction: discord.Interaction, control) -> str:
         return "Command not allowed in this channel."
     return "You cannot use this command here."
 
-def _control_rank(control):
-    success_cd = getattr(control, "_success_cooldown_float", 0.0)
-    failure_cd = getattr(control, "_failure_cooldown_float", 0.0)
-    lowest = min(success_cd, failure_cd)
-    return (lowest, success_cd, failure_cd)
-
 def resolve_control_for_interaction(config, interaction: discord.Interaction):
-    controls = getattr(config, "_controls_list", []) if config is not None else []
-    if not controls:
+    access_table = getattr(config, "_access_table", None) if config is not None else None
+    if not access_table:
         return None, None
 
-    role_matched_controls = []
-    for control in controls:
-        if _role_matches_control(interaction, control):
-            role_matched_controls.append(control)
-
-    if not role_matched_controls:
-        return None, "You are missing the required role to use this command."
-
-    allowed_controls = []
-    for control in role_matched_controls:
-        if _scope_allows_control(interaction, control):
-            allowed_controls.append(control)
-
-    if allowed_controls:
-        selected = min(allowed_controls, key=_control_rank)
+    selected, first_role_match = access_table.resolve(
+        getattr(interaction.user, "roles", None),
+        interaction.guild_id,
+        interaction.channel_id,
+    )
+    if selected is not None:
         return selected, None
-
-    return None, _scope_denied_message(interaction, role_matched_controls[0])
+    if first_role_match is None:
+        return None, "You are missing the required role to use this command."
+    return None, _scope_denied_message(interaction, first_role_match)
 
 def with_cooldown(config):
     config_name = str(getattr(config, "_name", "") or "").strip()
@@ -291,12 +261,23 @@ def with_cooldown(config):
                 await interaction.response.send_message(deny_message, ephemeral=True)
                 return False
 
+            # Handed to the command body (see _backend_work) so the access table is resolved once per command.
+            interaction.extras[MATCHED_CONTROL_EXTRA] = matched_control
             command_key = cooldown_manager.get_command_key(active_config, func.__name__, matched_control)
             now = time.monotonic()
             remaining = cooldown_manager.get_remaining(interaction.user.id, command_key, now)
             if remaining > 0:
                 await interaction.response.send_message(f"{interaction.user.mention}, you are on cooldown. Try again in {remaining:.2f}s.", ephemeral=True)
                 return False
+            limit_source = matched_control if matched_control is not None else active_config
+            admitted, retry_after = rate_limiter.acquire(interaction.user.id, command_key, limit_source, now)
+            if not admitted:
+                if retry_after > 0:
+                    message = f"{interaction.user.mention}, too many requests. Try again in {retry_after:.2f}s."
+                else:
+                    message = f"{interaction.user.mention}, you already have {rate_limiter.in_flight(interaction.user.id, command_key)} request(s) running. Wait for them to finish."
+                await interaction.response.send_message(message, ephemeral=True)
+                return False
             try:
                 result = await func(interaction, *args, **kwargs)
                 success = bool(result)
@@ -304,6 +285,8 @@ def with_cooldown(config):
                 cooldown_seconds = cooldown_manager.get_cooldown_seconds(active_config, False, matched_control)
                 cooldown_manager.set_cooldown(interaction.user.id, command_key, cooldown_seconds, time.monotonic())
                 raise
+            finally:
+                rate_limiter.release(interaction.user.id, command_key)
 
             cooldown_seconds = cooldown_manager.get_cooldown_seconds(active_config, success, matched_control)
             cooldown_manager.set_cooldown(interaction.user.id, command_key, cooldown_seconds, time.monotonic())
@@ -315,6 +298,33 @@ async def server_autocomplete(interaction: discord.Interaction, current: str):
     names = await dasab_server_info.get_autocomplete_names(current, limit=25)
     return [app_commands.Choice(name=name, value=name) for name in names]
 
+def _backend_work(config, message: str | None = None, interaction: discord.Interaction | None = None):
+    priority = 0
+    on_queued = None
+    if interaction is not None:
+        matched_control = interaction.extras.get(MATCHED_CONTROL_EXTRA)
+        priority = getattr(matched_control if matched_control is not None else config, "_priority_int", 0)
+
+        async def on_queued(position: int, queued: int):
+            await interaction.edit_original_response(
+                content=f"Server manager is busy; your request is queued at position {position} of {queued}..."
+            )
+
+    async def work(server_filter: str):
+        return await dasab_server_info.execute_backend_req_async(
+            server_filter,
+            config._backend_req_list,
+            message=message,
+            response_processing=getattr(config, "_response_processing_plan", None),
+            require_single_match=getattr(config, "_require_single_match_bool", True),
+            max_parallel=getattr(config, "_max_parallel_int", 1),
+            deadline_seconds=getattr(config, "_deadline_seconds_float", 0.0),
+            invalidates_cache=getattr(config, "_invalidates_cache_bool", False),
+            priority=priority,
+            on_queued=on_queued,
+        )
+    return work
+
 async def _run(interaction: discord.Interaction, work_fn, server_filter: str, action_label: str, use_thread: bool = True):
     await interaction.response.send_message("Working on the request, this may take some time...")
     if use_thread:
@@ -332,14 +342,10 @@ async def server_list(interaction: discord.Interaction):
     if list_serv_cfg is not None and getattr(list_serv_cfg, "_backend_req_list", None):
         return await _run(
             interaction,
-            lambda sf: dasab_server_info.execute_backend_req(
-                sf,
-                list_serv_cfg._backend_req_list,
-                response_processing=getattr(list_serv_cfg, "_response_processing_dict", None),
-                require_single_match=getattr(list_serv_cfg, "_require_single_match_bool", True),
-            ),
+            _backend_work(list_serv_cfg, interaction=interaction),
             server_filter,
             "Requesed server list",
+            use_thread=False,
         )
     return await _run(
         interaction,
@@ -355,14 +361,10 @@ async def server_req_start(interaction: discord.Interaction, server_filter: str
     if req_serv_start_cfg is not None and getattr(req_serv_start_cfg, "_backend_req_list", None):
         return await _run(
             interaction,
-            lambda sf: dasab_server_info.execute_backend_req(
-                sf,
-                req_serv_start_cfg._backend_req_list,
-                response_processing=getattr(req_serv_start_cfg, "_response_processing_dict", None),
-                require_single_match=getattr(req_serv_start_cfg, "_require_single_match_bool", True),
-            ),
+            _backend_work(req_serv_start_cfg, interaction=interaction),
             server_filter,
             "Requested server start",
+            use_thread=False,
         )
     return await _run(interaction, dasab_server_info.request_server_start, server_filter, "Requested server start")
 
@@ -372,14 +374,10 @@ async def server_req_stop(interaction: discord.Interaction, server_filter: str =
     if req_serv_stop_cfg is not None and getattr(req_serv_stop_cfg, "_backend_req_list", None):
         return await _run(
             interaction,
-            lambda sf: dasab_server_info.execute_backend_req(
-                sf,
-                req_serv_stop_cfg._backend_req_list,
-                response_processing=getattr(req_serv_stop_cfg, "_response_processing_dict", None),
-                require_single_match=getattr(req_serv_stop_cfg, "_require_single_match_bool", True),
-            ),
+            _backend_work(req_serv_stop_cfg, interaction=interaction),
             server_filter,
             "Requested server stop",
+            use_thread=False,
         )
     return await _run(interaction, dasab_server_info.request_server_stop, server_filter, "Requested server stop")
 
@@ -389,14 +387,10 @@ async def server_req_restart(interaction: discord.Interaction, server_filter: st
     if req_serv_restart_cfg is not None and getattr(req_serv_restart_cfg, "_backend_req_list", None):
         return await _run(
             interaction,
-            lambda sf: dasab_server_info.execute_backend_req(
-                sf,
-                req_serv_restart_cfg._backend_req_list,
-                response_processing=getattr(req_serv_restart_cfg, "_response_processing_dict", None),
-                require_single_match=getattr(req_serv_restart_cfg, "_require_single_match_bool", True),
-            ),
+            _backend_work(req_serv_restart_cfg, interaction=interaction),
             server_filter,
             "Requested server restart",
+            use_thread=False,
         )
     return await _run(interaction, dasab_server_info.request_server_restart, server_filter, "Requested server restart")
 
@@ -406,14 +400,10 @@ async def server_req_update(interaction: discord.Interaction, server_filter: str
     if req_serv_update_cfg is not None and getattr(req_serv_update_cfg, "_backend_req_list", None):
         return await _run(
             interaction,
-            lambda sf: dasab_server_info.execute_backend_req(
-                sf,
-                req_serv_update_cfg._backend_req_list,
-                response_processing=getattr(req_serv_update_cfg, "_response_processing_dict", None),
-                require_single_match=getattr(req_serv_update_cfg, "_require_single_match_bool", True),
-            ),
+            _backend_work(req_serv_update_cfg, interaction=interaction),
             server_filter,
             "Requested server update",
+            use_thread=False,
         )
     return await _run(interaction, dasab_server_info.request_server_update, server_filter, "Requested server update")
 
@@ -423,15 +413,10 @@ async def send_command(interaction: discord.Interaction, server_filter: str, mes
     if rconcmd_cfg is not None and getattr(rconcmd_cfg, "_backend_req_list", None):
         return await _run(
             interaction,
-            lambda sf: dasab_server_info.execute_backend_req(
-                sf,
-                rconcmd_cfg._backend_req_list,
-                message=message,
-                response_processing=getattr(rconcmd_cfg, "_response_processing_dict", None),
-                require_single_match=getattr(rconcmd_cfg, "_require_single_match_bool", True),
-            ),
+            _backend_work(rconcmd_cfg, message=message, interaction=interaction),
             server_filter,
             "Requested command send",
+            use_thread=False,
         )
     await interaction.response.send_message("Failed. send_command has no backend_req configured.", ephemeral=True)
     return False
@@ -446,8 +431,7 @@ async def reload_discord_config(interaction: discord.Interaction):
     try:
         reloaded_commands = _reload_command_configs_from_disk()
         reloaded_servers = dasab_server_info.reload_server_configs()
-        if not dasab_server_info.is_cache_refreshing():
-            asyncio.create_task(dasab_server_info.refresh_server_list_cache())
+        dasab_server_info.start_cache_refresh()
         await interaction.followup.send(
             (
                 "Success. Reloaded runtime config."
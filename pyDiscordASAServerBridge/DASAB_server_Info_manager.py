@@ -1,23 +1,39 @@
 import asyncio
+import heapq
+import itertools
 import json
+import math
 import os
+import queue
+import random
+import threading
 import time
-import re
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+import aiohttp
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 from DASAB_server_info import (
+    DASAB_HTTP_CONFIG,
+    DASAB_REFRESH_CONFIG,
+    DASAB_SEARCH_INDEX,
     DASAB_SERVER_CONFIG,
     DASAB_SERVER_INFO,
+    DASAB_SERVER_SNAPSHOT,
     DEFAULT_DISPLAY_FIELDS,
     DEFAULT_DISPLAY_TEMPLATE,
+    DisplayRenderer,
 )
+from DASAB_templates import PayloadTemplate, ResponseRenderPlan, compile_template
 from utils import load_json_file_with_comments
 
 SERVER_CONFIG_PATH = "DASAB_CFG_SERVERS.json"
 ASA_MANAGER_TOKEN_ENV = "ASA_MANAGER_TOKEN"
-DEFAULT_HTTP_TIMEOUT_SECONDS = 10
+BATTLEMETRICS_SERVERS_URL = "https://api.battlemetrics.com/servers"
 SERVER_PLACEHOLDER_NAMES = (
     "server_id",
     "server_profile",
@@ -25,12 +41,27 @@ SERVER_PLACEHOLDER_NAMES = (
     "server_ip",
     "server_port",
 )
-BRACED_DOLLAR_PATTERN = re.compile(r"\{\$([A-Za-z_][A-Za-z0-9_]*)\}")
-DOLLAR_BRACED_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
-DOLLAR_PATTERN = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
-BRACED_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
 BACKEND_LOG_PATH = "DASAB_backend_requests.log"
-_MISSING = object()
+SERVER_SNAPSHOT_PATH = "DASAB_server_snapshot.json"
+SERVER_SNAPSHOT_VERSION = 2
+SERVER_SNAPSHOT_MAX_AGE_SECONDS = 24 * 60 * 60
+SERVER_SNAPSHOT_SAVE_INTERVAL_SECONDS = 60
+BACKEND_LOG_MAX_BYTES = 5 * 1024 * 1024
+BACKEND_LOG_BACKUP_COUNT = 3
+BACKEND_LOG_MAX_PENDING = 5000
+BACKEND_LOG_BATCH_SIZE = 500
+BACKEND_LOG_CLOSE_TIMEOUT_SECONDS = 2.0
+HTTP_SESSION_RETIRE_MARGIN_SECONDS = 1.0
+HEDGE_METHODS = ("GET", "HEAD")
+COALESCE_METHODS = ("GET", "HEAD")
+COALESCE_CACHE_SIZE = 256
+ADMISSION_LIGHT_METHODS = ("GET", "HEAD")
+HEDGE_DEFAULT_DELAY_SECONDS = 1.0
+HEDGE_MIN_DELAY_SECONDS = 0.05
+LATENCY_SAMPLE_SIZE = 64
+LATENCY_MIN_SAMPLES = 5
+LATENCY_EWMA_ALPHA = 0.3
+MATCH_CACHE_SIZE = 256
 
 
 class _SafeDict(dict):
@@ -38,36 +69,398 @@ class _SafeDict(dict):
         return ""
 
 
-def _append_backend_log(line: str):
-    try:
-        with open(BACKEND_LOG_PATH, "a", encoding="utf-8") as handle:
-            handle.write(line + "\n")
-    except Exception:
-        pass
+class _BackendResponse:
+    __slots__ = ("status_code", "text")
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+
+
+class _ManageUrlHealth:
+    __slots__ = ("latencies", "latency_ewma", "consecutive_failures", "open_until", "probing")
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.latency_ewma = None
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def is_available(self, now: float):
+        if self.open_until == 0.0:
+            return True
+        return now >= self.open_until and not self.probing
+
+    def try_acquire(self, now: float):
+        # Closed circuits always pass; an open circuit lets a single half-open probe through after its cooldown.
+        if self.open_until == 0.0:
+            return True
+        if now < self.open_until or self.probing:
+            return False
+        self.probing = True
+        return True
+
+    def release_probe(self):
+        self.probing = False
+
+    def record_success(self, seconds: float | None):
+        # Only 2xx replies pass a latency; a fast 404 proves the URL is up but says nothing about serving requests.
+        if seconds is not None:
+            self.latencies.append(seconds)
+            if self.latency_ewma is None:
+                self.latency_ewma = seconds
+            else:
+                self.latency_ewma += LATENCY_EWMA_ALPHA * (seconds - self.latency_ewma)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def record_failure(self, now: float, failure_threshold: int, cooldown_seconds: float):
+        self.consecutive_failures += 1
+        self.probing = False
+        if self.open_until != 0.0 or self.consecutive_failures >= failure_threshold:
+            self.open_until = now + cooldown_seconds
+
+    def latency_p95(self):
+        if len(self.latencies) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class _RefreshSchedule:
+    """Per-server next refresh times: hot servers come round often, idle/offline ones back off, within a call budget."""
+
+    STABLE_STATUSES = ("online",)
+    OFFLINE_STATUSES = ("offline", "dead", "stopped", "invalid")
+
+    def __init__(self, refresh_config: DASAB_REFRESH_CONFIG):
+        self.config = refresh_config
+        self.next_due = {}
+        self.last_queried = {}
+        self.last_status = {}
+        self.backoff = {}
+        self._tokens = float(refresh_config.budget_per_minute)
+        self._tokens_at = time.monotonic()
+
+    def touch(self, server_id, now: float):
+        key = str(server_id)
+        self.last_queried[key] = now
+        due = self.next_due.get(key)
+        hot_due = now + self.config.hot_interval_seconds
+        if due is not None and due > hot_due:
+            self.next_due[key] = hot_due
+
+    def record(self, server_id, server, now: float):
+        key = str(server_id)
+        interval = self._interval(key, server, now)
+        jitter = self.config.jitter_ratio
+        if jitter > 0:
+            interval *= 1.0 + random.uniform(-jitter, jitter)
+        self.next_due[key] = now + interval
+
+    def _interval(self, key: str, server, now: float) -> float:
+        config = self.config
+        if server is None:
+            return self._backed_off(key)
+        status = str(server.status or "").strip().casefold()
+        previous_status = self.last_status.get(key)
+        self.last_status[key] = status
+        transitioning = previous_status is not None and previous_status != status
+        if status and status not in self.STABLE_STATUSES and status not in self.OFFLINE_STATUSES:
+            transitioning = True
+        recently_queried = now - self.last_queried.get(key, float("-inf")) <= config.hot_window_seconds
+        if transitioning or recently_queried or self._is_populated(server):
+            self.backoff.pop(key, None)
+            return config.hot_interval_seconds
+        if status in self.OFFLINE_STATUSES:
+            return self._backed_off(key)
+        self.backoff.pop(key, None)
+        return config.idle_interval_seconds
+
+    def _backed_off(self, key: str) -> float:
+        # Offline or unreachable servers start at the idle interval and double up to offline_interval_seconds.
+        steps = self.backoff.get(key, 0)
+        self.backoff[key] = steps + 1
+        return min(self.config.offline_interval_seconds, self.config.idle_interval_seconds * (2 ** steps))
+
+    @staticmethod
+    def _is_populated(server) -> bool:
+        try:
+            return int(str(server.player).strip() or 0) > 0
+        except ValueError:
+            return False
+
+    def take_due(self, server_ids, now: float) -> list:
+        budget = self.config.budget_per_minute
+        self._tokens = min(float(budget), self._tokens + (now - self._tokens_at) * budget / 60.0)
+        self._tokens_at = now
+        due = [
+            (self.next_due.get(str(server_id), float("-inf")), index, server_id)
+            for index, server_id in enumerate(server_ids)
+            if self.next_due.get(str(server_id), float("-inf")) <= now
+        ]
+        due.sort()
+        allowed = int(self._tokens)
+        selected = [server_id for _, _, server_id in due[:allowed]]
+        self._tokens -= len(selected)
+        return selected
+
+    def retain(self, server_ids):
+        keep = {str(server_id) for server_id in server_ids}
+        for table in (self.next_due, self.last_queried, self.last_status, self.backoff):
+            for key in [key for key in table if key not in keep]:
+                del table[key]
+
+
+class _AdmissionQueue:
+    """Global cap on running backend commands; waiters are admitted by priority, then read-only first, then arrival."""
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.running = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self.admitted = 0
+        self.shed = 0
+        self.peak_queued = 0
+
+    def configure(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._wake()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "peak_queued": self.peak_queued,
+        }
+
+    def position(self, rank) -> int:
+        return 1 + sum(1 for waiter_rank, _ in self._waiters if waiter_rank < rank)
+
+    async def acquire(self, priority: int, heavy: bool, on_queued=None) -> bool:
+        if self.running < self.max_concurrent and not self._waiters:
+            self.running += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queued:
+            self.shed += 1
+            return False
+
+        rank = (-priority, 1 if heavy else 0, next(self._seq))
+        waiter = (rank, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, waiter)
+        self.peak_queued = max(self.peak_queued, len(self._waiters))
+        try:
+            if on_queued is not None:
+                try:
+                    await on_queued(self.position(rank), self.queued)
+                except Exception as e:
+                    print(f"Error reporting queue position: {e}")
+            await waiter[1]
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            elif waiter[1].done() and not waiter[1].cancelled():
+                # The slot was handed over just as the caller went away; pass it on.
+                self.release()
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.running -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.running < self.max_concurrent:
+            _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.running += 1
+            future.set_result(None)
+
+
+_LOG_STOP = object()
+
+
+class _BackendLogWriter:
+    """Appends backend log entries from a daemon thread so the request path never waits on disk."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = BACKEND_LOG_MAX_BYTES,
+        backup_count: int = BACKEND_LOG_BACKUP_COUNT,
+        max_pending: int = BACKEND_LOG_MAX_PENDING,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.written = 0
+        self.dropped = 0
+        self._unreported_drops = 0
+        self._size = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def write(self, entry: str):
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            self._start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Backlog is full (disk stalled or a burst of requests): drop instead of blocking the caller.
+            with self._lock:
+                self.dropped += 1
+                self._unreported_drops += 1
+
+    def close(self, timeout: float = BACKEND_LOG_CLOSE_TIMEOUT_SECONDS):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_LOG_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="DASAB-backend-log", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            stop = entry is _LOG_STOP
+            batch = [] if stop else [entry]
+            while not stop and len(batch) < BACKEND_LOG_BATCH_SIZE:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _LOG_STOP:
+                    stop = True
+                else:
+                    batch.append(entry)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list[str]):
+        with self._lock:
+            dropped = self._unreported_drops
+            self._unreported_drops = 0
+        if dropped:
+            batch.append(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] dropped {dropped} log entries (writer backlog full)")
+        if not batch:
+            return
+        data = "\n".join(batch) + "\n"
+        size = len(data.encode("utf-8"))
+        try:
+            if self._size is None:
+                self._size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if self.max_bytes > 0 and self._size > 0 and self._size + size > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(data)
+            self._size += size
+            self.written += len(batch)
+        except Exception:
+            self._size = None
+
+    def _rotate(self):
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._size = 0
+
+
+def _format_age(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m"
+
 
 class DASAB_SERVER_INFO_MANAGER:
     server_info_list = []
     def __init__(self):
         load_dotenv()
-        self.server_configs, self.display_template, self.display_fields = self._load_server_configs(
-            SERVER_CONFIG_PATH
+        (
+            self.server_configs,
+            self.display_template,
+            self.display_fields,
+            self.http_config,
+            self.refresh_config,
+        ) = self._load_server_configs(SERVER_CONFIG_PATH)
+        self._display_renderer = DisplayRenderer(self.display_template, self.display_fields)
+        self._backend_log = _BackendLogWriter(BACKEND_LOG_PATH)
+        self._http_session = self._build_http_session(self.http_config)
+        self._async_session = None
+        self._retiring_sessions = set()
+        self._manage_url_health = {}
+        self._refresh_schedule = _RefreshSchedule(self.refresh_config)
+        self._backend_inflight = {}
+        self._backend_waiters = {}
+        self._backend_recent = OrderedDict()
+        self._follow_ups = {}
+        self._admission = _AdmissionQueue(
+            self.http_config.max_concurrent_commands,
+            self.http_config.max_queued_commands,
         )
         self._config_by_id = {}
         self._config_by_profile = {}
         self._config_by_ip_port = {}
+        self._config_match_index = DASAB_SEARCH_INDEX([])
+        self._match_cache = OrderedDict()
         self._index_server_configs()
         self._cache_ttl_seconds = 120
-        self._cache = {"ts": 0.0, "data": "", "refreshing": False}
+        self._cache = {"ts": 0.0, "snapshot": DASAB_SERVER_SNAPSHOT()}
+        self._cache_generation = 0
+        self._cache_refresh_task = None
+        self._cache_refresh_generation = 0
+        self._refresh_loop_running = False
+        self._snapshot_dirty = False
+        self._snapshot_saved_at = 0.0
+        self._load_cached_snapshot()
 
     def _load_server_configs(self, filename: str):
         if not os.path.exists(filename):
             print(f"Error: Server configuration file '{filename}' not found.")
-            return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS
+            return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS, DASAB_HTTP_CONFIG(), DASAB_REFRESH_CONFIG()
         try:
             data = load_json_file_with_comments(filename)
             if not isinstance(data, dict):
                 print(f"Error: Server configuration file '{filename}' is not a JSON object.")
-                return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS
+                return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS, DASAB_HTTP_CONFIG(), DASAB_REFRESH_CONFIG()
             servers = data.get("servers", [])
             if not isinstance(servers, list):
                 print(f"Error: Server configuration file '{filename}' has invalid 'servers' list.")
@@ -76,6 +469,8 @@ class DASAB_SERVER_INFO_MANAGER:
             display_fields = data.get("display_fields", DEFAULT_DISPLAY_FIELDS)
             if not isinstance(display_fields, dict):
                 display_fields = DEFAULT_DISPLAY_FIELDS
+            http_config = DASAB_HTTP_CONFIG.from_dict(data.get("http"))
+            refresh_config = DASAB_REFRESH_CONFIG.from_dict(data.get("refresh"))
             configs = []
             for srv in servers:
                 if not isinstance(srv, dict):
@@ -84,25 +479,137 @@ class DASAB_SERVER_INFO_MANAGER:
                     configs.append(DASAB_SERVER_CONFIG.from_dict(srv))
                 except Exception:
                     continue
-            return configs, display_template, display_fields
+            return configs, display_template, display_fields, http_config, refresh_config
         except json.JSONDecodeError as e:
             print(f"Error decoding JSON from file '{filename}': {e}")
-            return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS
+            return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS, DASAB_HTTP_CONFIG(), DASAB_REFRESH_CONFIG()
         except IOError as e:
             print(f"Error opening or reading file '{filename}': {e}")
-            return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS
+            return [], DEFAULT_DISPLAY_TEMPLATE, DEFAULT_DISPLAY_FIELDS, DASAB_HTTP_CONFIG(), DASAB_REFRESH_CONFIG()
 
     def reload_server_configs(self, filename: str = SERVER_CONFIG_PATH) -> int:
-        loaded_configs, loaded_template, loaded_fields = self._load_server_configs(filename)
+        (
+            loaded_configs,
+            loaded_template,
+            loaded_fields,
+            loaded_http,
+            loaded_refresh,
+        ) = self._load_server_configs(filename)
         self.server_configs = loaded_configs
         self.display_template = loaded_template
         self.display_fields = loaded_fields
+        previous_fingerprint = self._display_renderer.fingerprint
+        self._display_renderer = DisplayRenderer(loaded_template, loaded_fields)
+        self.refresh_config = loaded_refresh
+        self._refresh_schedule.config = loaded_refresh
+        self._admission.configure(loaded_http.max_concurrent_commands, loaded_http.max_queued_commands)
+        if loaded_http != self.http_config:
+            old_http = self.http_config
+            old_session = self._http_session
+            old_async_session = self._async_session
+            self.http_config = loaded_http
+            self._http_session = self._build_http_session(loaded_http)
+            self._async_session = None
+            # Calls already in flight keep the old sessions; close them once those calls have had time to finish.
+            self._retire_http_sessions(
+                old_session,
+                old_async_session,
+                old_http.timeout_seconds + old_http.connect_timeout_seconds + HTTP_SESSION_RETIRE_MARGIN_SECONDS,
+            )
+        self._backend_recent.clear()
         self._index_server_configs()
-        self.server_info_list = []
-        cache_refreshing = bool(self._cache.get("refreshing", False))
-        self._cache = {"ts": 0.0, "data": "", "refreshing": cache_refreshing}
+        self._refresh_schedule.retain(self._refresh_server_ids())
+        # A refresh already in flight was started for the old configs; its result is discarded.
+        self._cache_generation += 1
+        self._retain_configured_servers(previous_fingerprint == self._display_renderer.fingerprint)
         return len(self.server_configs)
 
+    def _retain_configured_servers(self, display_unchanged: bool):
+        configured = {str(server_id) for server_id in self._refresh_server_ids()}
+        for key in [key for key in self._follow_ups if key not in configured]:
+            self._follow_ups.pop(key).cancel()
+        kept = []
+        # Lines rendered with another display_template/display_fields cannot be re-rendered without a fetch.
+        if display_unchanged:
+            for server in self.server_info_list:
+                if str(server.id) in configured:
+                    server.config = self._find_config_for_info(server)
+                    kept.append(server)
+        self.server_info_list = kept
+        ts = self._cache["ts"] if kept else 0.0
+        self._cache = {"ts": ts, "snapshot": DASAB_SERVER_SNAPSHOT.from_infos(kept, ts)}
+
+    @staticmethod
+    def _build_http_session(http_config: DASAB_HTTP_CONFIG):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=http_config.pool_connections,
+            pool_maxsize=http_config.pool_maxsize,
+            pool_block=http_config.pool_block,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _retire_http_sessions(self, session, async_session, grace_seconds: float):
+        if async_session is not None and async_session.closed:
+            async_session = None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            timer = threading.Timer(grace_seconds, session.close)
+            timer.daemon = True
+            timer.start()
+            return
+        task = loop.create_task(self._close_sessions_later(session, async_session, grace_seconds))
+        self._retiring_sessions.add(task)
+        task.add_done_callback(self._retiring_sessions.discard)
+
+    @staticmethod
+    async def _close_sessions_later(session, async_session, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            session.close()
+            if async_session is not None and not async_session.closed:
+                await async_session.close()
+
+    def close(self):
+        session = getattr(self, "_http_session", None)
+        if session is not None:
+            session.close()
+        backend_log = getattr(self, "_backend_log", None)
+        if backend_log is not None:
+            backend_log.close()
+
+    async def aclose(self):
+        await self._flush_cached_snapshot()
+        follow_ups = list(self._follow_ups.values())
+        self._follow_ups.clear()
+        for task in follow_ups:
+            task.cancel()
+        if follow_ups:
+            await asyncio.gather(*follow_ups, return_exceptions=True)
+        inflight = list(self._backend_inflight.values())
+        self._backend_inflight.clear()
+        self._backend_waiters.clear()
+        self._backend_recent.clear()
+        for task in inflight:
+            task.cancel()
+        if inflight:
+            await asyncio.gather(*inflight, return_exceptions=True)
+        # Shutting down: close sessions retired by a reload now instead of after their grace period.
+        retiring = list(self._retiring_sessions)
+        for task in retiring:
+            task.cancel()
+        if retiring:
+            await asyncio.gather(*retiring, return_exceptions=True)
+        async_session = self._async_session
+        self._async_session = None
+        if async_session is not None and not async_session.closed:
+            await async_session.close()
+        self.close()
+
     def _extract_server_id(self, server_cfg):
         if isinstance(server_cfg, DASAB_SERVER_CONFIG):
             return server_cfg.server_id
@@ -153,6 +660,16 @@ class DASAB_SERVER_INFO_MANAGER:
             ip_port_key = self._normalize_ip_port(cfg.server_ip, cfg.server_port)
             if ip_port_key and ip_port_key not in self._config_by_ip_port:
                 self._config_by_ip_port[ip_port_key] = cfg
+        self._config_match_index = DASAB_SEARCH_INDEX(
+            (
+                cfg.server_id,
+                cfg.server_profile,
+                cfg.server_name,
+                f"{cfg.server_ip}:{cfg.server_port}" if cfg.server_ip and cfg.server_port else "",
+            )
+            for cfg in self.server_configs
+        )
+        self._match_cache = OrderedDict()
 
     def _find_config_for_payload_item(self, item: dict):
         if not isinstance(item, dict):
@@ -253,154 +770,13 @@ class DASAB_SERVER_INFO_MANAGER:
     def _render_template(self, template: str, context: dict):
         if not template:
             return template
+        return compile_template(template).render(context)
 
-        def repl(match):
-            key = match.group(1)
-            value = context.get(key)
-            return "" if value is None else str(value)
-
-        result = BRACED_DOLLAR_PATTERN.sub(repl, template)
-        result = DOLLAR_BRACED_PATTERN.sub(repl, result)
-        result = DOLLAR_PATTERN.sub(repl, result)
-        result = BRACED_PATTERN.sub(repl, result)
-        return result
-
-    @staticmethod
-    def _normalize_lookup_segment(value):
-        return str(value).strip().casefold()
-
-    @staticmethod
-    def _normalize_lookup_path(value):
-        if value is None:
-            return ""
-        parts = [part for part in str(value).strip().split(".") if part.strip()]
-        return ".".join(DASAB_SERVER_INFO_MANAGER._normalize_lookup_segment(part) for part in parts)
-
-    def _build_lookup_index(self, obj, index=None, path=None):
-        if index is None:
-            index = {"by_key": {}, "by_path": {}}
-        if path is None:
-            path = []
-
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                key_norm = self._normalize_lookup_segment(key)
-                current_path = [*path, key_norm]
-                path_key = ".".join(current_path)
-                if value is not None:
-                    index["by_key"].setdefault(key_norm, value)
-                    index["by_path"].setdefault(path_key, value)
-                self._build_lookup_index(value, index, current_path)
-        elif isinstance(obj, list):
-            for idx, item in enumerate(obj):
-                current_path = [*path, str(idx)]
-                path_key = ".".join(current_path)
-                if item is not None:
-                    index["by_path"].setdefault(path_key, item)
-                self._build_lookup_index(item, index, current_path)
-        return index
-
-    def _resolve_response_value(self, index: dict, candidate):
-        if candidate is None:
-            return _MISSING
-        candidate_text = str(candidate).strip()
-        if not candidate_text:
-            return _MISSING
-
-        normalized_key = self._normalize_lookup_segment(candidate_text)
-        normalized_path = self._normalize_lookup_path(candidate_text)
-        by_path = index.get("by_path", {})
-        by_key = index.get("by_key", {})
-
-        if normalized_path and normalized_path in by_path and by_path[normalized_path] is not None:
-            return by_path[normalized_path]
-        if normalized_key in by_key and by_key[normalized_key] is not None:
-            return by_key[normalized_key]
-        return _MISSING
-
-    def _extract_template_tokens(self, template: str):
-        tokens = set()
-        if not template:
-            return tokens
-        for pattern in (BRACED_DOLLAR_PATTERN, DOLLAR_BRACED_PATTERN, DOLLAR_PATTERN, BRACED_PATTERN):
-            for match in pattern.finditer(template):
-                token = match.group(1)
-                if token:
-                    tokens.add(token)
-        return tokens
-
-    def _format_response_item(self, payload, response_processing: dict):
-        if not isinstance(response_processing, dict):
-            return None
-        template = str(response_processing.get("template", "") or "").strip()
-        if not template:
-            return None
-
-        fields = response_processing.get("fields", {})
-        if not isinstance(fields, dict):
-            fields = {}
-
-        placeholders = self._extract_template_tokens(template)
-        if not placeholders:
-            placeholders = set(fields.keys())
-
-        index = self._build_lookup_index(payload)
-        context = {}
-        for placeholder in placeholders:
-            mapping = fields.get(placeholder, placeholder)
-            candidates = list(mapping) if isinstance(mapping, list) else [mapping]
-            if not any(str(candidate).strip() == placeholder for candidate in candidates):
-                candidates.append(placeholder)
-
-            value = _MISSING
-            for candidate in candidates:
-                value = self._resolve_response_value(index, candidate)
-                if value is not _MISSING:
-                    break
-
-            if value is _MISSING or value is None:
-                context[placeholder] = ""
-            elif isinstance(value, (dict, list)):
-                context[placeholder] = json.dumps(value, ensure_ascii=False)
-            else:
-                context[placeholder] = value
-
-        return self._render_template(template, context)
-
-    def _format_response_payload(self, payload, response_processing: dict | None):
-        if not isinstance(response_processing, dict):
-            return None
-
-        join_with = response_processing.get("join_with", "\n")
-        if not isinstance(join_with, str):
-            join_with = "\n"
-
-        if isinstance(payload, list):
-            list_cfg = dict(response_processing)
-            item_template = list_cfg.get("item_template")
-            if isinstance(item_template, str) and item_template.strip():
-                list_cfg["template"] = item_template
-            elif not isinstance(list_cfg.get("template"), str) or not str(list_cfg.get("template")).strip():
-                return None
-
-            lines = []
-            for item in payload:
-                if not isinstance(item, (dict, list)):
-                    continue
-                line = self._format_response_item(item, list_cfg)
-                if line is not None and line.strip():
-                    lines.append(line)
-            if lines:
-                return join_with.join(lines)
+    def _format_response_payload(self, payload, response_processing):
+        plan = ResponseRenderPlan.from_config(response_processing)
+        if plan is None:
             return None
-
-        if isinstance(payload, dict):
-            line = self._format_response_item(payload, response_processing)
-            if line is not None and line.strip():
-                return line
-            return None
-
-        return None
+        return plan.format_payload(payload)
 
     def _try_parse_json(self, text: str):
         if not text:
@@ -438,6 +814,7 @@ class DASAB_SERVER_INFO_MANAGER:
                 item_with_fallback,
                 self.display_template,
                 self.display_fields,
+                renderer=self._display_renderer,
             )
             info.config = cfg
             if info.str_info:
@@ -451,22 +828,10 @@ class DASAB_SERVER_INFO_MANAGER:
         return header + "\n".join(lines) + "\nDone listing servers"
 
     def _parse_payload(self, payload_template: object, context: dict):
-        if payload_template is None:
+        template = PayloadTemplate.from_config(payload_template)
+        if template is None:
             return None
-        if not isinstance(payload_template, str):
-            return payload_template
-        rendered = self._render_template(payload_template, context).strip()
-        if rendered == "":
-            return None
-        if rendered.startswith("{") or rendered.startswith("["):
-            try:
-                return json.loads(rendered)
-            except Exception:
-                try:
-                    return json.loads(rendered.replace("'", '"'))
-                except Exception:
-                    return rendered
-        return rendered
+        return template.render(context)
 
     def _build_context(self, server_cfg: DASAB_SERVER_CONFIG, message: str | None = None):
         return {
@@ -479,11 +844,9 @@ class DASAB_SERVER_INFO_MANAGER:
         }
 
     def _req_needs_server(self, req: dict):
-        end_pt = str(req.get("END_PT", ""))
-        payload = str(req.get("Payload", ""))
-        text = end_pt + " " + payload
-        for name in SERVER_PLACEHOLDER_NAMES:
-            if f"{{{name}}}" in text or f"${name}" in text or f"${{{name}}}" in text:
+        for key in ("END_PT", "Payload"):
+            tokens = compile_template(str(req.get(key, ""))).tokens
+            if any(name in tokens for name in SERVER_PLACEHOLDER_NAMES):
                 return True
         return False
 
@@ -499,57 +862,242 @@ class DASAB_SERVER_INFO_MANAGER:
                 urls.append(key)
         return urls
 
-    def _call_backend(self, method: str, url: str, payload, auth: bool):
+    def _backend_headers(self, auth: bool):
         headers = {}
         if auth:
             token = os.getenv(ASA_MANAGER_TOKEN_ENV, "").strip()
             if token:
                 headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    def _log_backend_request(self, method: str, url: str, headers: dict, payload):
+        entry = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {method} {url} HEADERS {headers}"
+        if payload is not None:
+            entry += f"\nPAYLOAD {payload}"
+        self._backend_log.write(entry)
+
+    def _log_backend_response(self, method: str, url: str, status_code: int, text: str):
+        entry = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {method} {url} -> {status_code}"
+        body_snippet = (text or "")[:2000]
+        if body_snippet:
+            entry += f"\n{body_snippet}"
+        self._backend_log.write(entry)
+
+    def _log_backend_error(self, method: str, url: str, error: Exception):
+        self._backend_log.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {method} {url} -> ERROR: {error}")
+
+    def _get_async_session(self):
+        session = self._async_session
+        if session is None or session.closed:
+            http_config = self.http_config
+            connector = aiohttp.TCPConnector(
+                limit=http_config.pool_connections * http_config.pool_maxsize,
+                limit_per_host=http_config.pool_maxsize,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=http_config.timeout_seconds,
+                    connect=http_config.connect_timeout_seconds,
+                ),
+            )
+            self._async_session = session
+        return session
+
+    async def _call_backend_async(self, method: str, url: str, payload, auth: bool):
+        headers = self._backend_headers(auth)
         try:
-            _append_backend_log(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {method} {url} HEADERS {headers}")
-            if payload is not None:
-                _append_backend_log(f"PAYLOAD {payload}")
-            if method == "GET":
-                resp = requests.get(url, headers=headers, timeout=DEFAULT_HTTP_TIMEOUT_SECONDS)
-            else:
+            self._log_backend_request(method, url, headers, payload)
+            kwargs = {"headers": headers}
+            if method != "GET":
                 if isinstance(payload, (dict, list)):
-                    resp = requests.request(
-                        method,
-                        url,
-                        headers=headers,
-                        json=payload,
-                        timeout=DEFAULT_HTTP_TIMEOUT_SECONDS,
-                    )
+                    kwargs["json"] = payload
                 elif payload is not None:
-                    resp = requests.request(
-                        method,
-                        url,
-                        headers=headers,
-                        data=str(payload),
-                        timeout=DEFAULT_HTTP_TIMEOUT_SECONDS,
-                    )
-                else:
-                    resp = requests.request(
-                        method,
-                        url,
-                        headers=headers,
-                        timeout=DEFAULT_HTTP_TIMEOUT_SECONDS,
-                    )
-            body_snippet = ""
-            try:
-                text = resp.text or ""
-                body_snippet = text[:2000]
-            except Exception:
-                body_snippet = ""
-            _append_backend_log(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {method} {url} -> {resp.status_code}")
-            if body_snippet:
-                _append_backend_log(body_snippet)
-            return resp
+                    kwargs["data"] = str(payload)
+            async with self._get_async_session().request(method, url, **kwargs) as resp:
+                text = ""
+                try:
+                    text = await resp.text(errors="replace") or ""
+                except Exception:
+                    text = ""
+                self._log_backend_response(method, url, resp.status, text)
+                return _BackendResponse(resp.status, text)
         except Exception as e:
-            _append_backend_log(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {method} {url} -> ERROR: {e}")
+            if isinstance(e, asyncio.TimeoutError):
+                e = TimeoutError(f"timed out after {self.http_config.timeout_seconds}s")
+            self._log_backend_error(method, url, e)
             return e
 
-    def _request_backend_for_urls(
+    def _prepare_backend_request(self, req_cfg: dict, context: dict):
+        method = str(req_cfg.get("type", "GET")).upper()
+        end_pt = str(req_cfg.get("END_PT", "")).strip()
+        auth = bool(req_cfg.get("Auth", False))
+        payload_template = req_cfg.get("_payload_template")
+        if payload_template is None:
+            payload_template = req_cfg.get("Payload")
+        payload = self._parse_payload(payload_template, context)
+
+        if end_pt:
+            end_pt = self._render_template(end_pt, context)
+        return method, end_pt, auth, payload
+
+    @staticmethod
+    def _build_backend_url(base_url: str, end_pt: str):
+        url = base_url.rstrip("/")
+        if end_pt:
+            url = f"{url}/{end_pt.lstrip('/')}"
+        return url
+
+    def _evaluate_backend_response(self, resp, server_filter: str, response_processing: dict | None):
+        body = resp.text or ""
+        parsed = self._try_parse_json(body)
+        processed = self._format_response_payload(parsed, response_processing) if parsed is not None else None
+
+        if 200 <= resp.status_code < 300:
+            if processed:
+                return True, "Success.\n" + processed
+            formatted = self._format_server_list_payload(parsed, server_filter) if parsed is not None else None
+            if formatted:
+                return True, formatted
+            if body:
+                return True, "Success.\n" + body
+            return True, "Success."
+
+        if processed:
+            return False, "Failed.\n" + processed
+        if body:
+            return False, "Failed.\n" + body[:2000]
+        return False, ""
+
+    def _record_backend_result(self, base_url: str, resp, started: float):
+        health = self._url_health(base_url)
+        now = time.monotonic()
+        if isinstance(resp, Exception) or resp.status_code >= 500:
+            health.record_failure(
+                now,
+                self.http_config.circuit_failure_threshold,
+                self.http_config.circuit_cooldown_seconds,
+            )
+        else:
+            health.record_success(now - started if 200 <= resp.status_code < 300 else None)
+
+    async def _attempt_backend_url_async(self, method, base_url, end_pt, payload, auth, server_filter, response_processing):
+        url = self._build_backend_url(base_url, end_pt)
+        health = self._url_health(base_url)
+        is_probe = health.open_until != 0.0
+        if not health.try_acquire(time.monotonic()):
+            return False, ""
+        resp = None
+        try:
+            if method in COALESCE_METHODS:
+                resp = await self._call_backend_coalesced(method, base_url, url, payload, auth)
+            else:
+                resp = await self._call_backend_recorded_async(method, base_url, url, payload, auth)
+        finally:
+            if resp is None and is_probe:
+                # Cancelled (hedge lost or deadline hit): free the half-open probe slot without judging the URL.
+                health.release_probe()
+        if isinstance(resp, Exception):
+            return False, f"Failed. {method} request failed for {url}: {resp}"
+        return self._evaluate_backend_response(resp, server_filter, response_processing)
+
+    async def _call_backend_recorded_async(self, method: str, base_url: str, url: str, payload, auth: bool):
+        started = time.monotonic()
+        resp = await self._call_backend_async(method, url, payload, auth)
+        self._record_backend_result(base_url, resp, started)
+        return resp
+
+    @staticmethod
+    def _coalesce_key(method: str, url: str, payload, auth: bool):
+        try:
+            payload_key = json.dumps(payload, sort_keys=True, default=str)
+        except Exception:
+            payload_key = repr(payload)
+        return (method, url, payload_key, auth)
+
+    async def _call_backend_coalesced(self, method: str, base_url: str, url: str, payload, auth: bool):
+        key = self._coalesce_key(method, url, payload, auth)
+        recent = self._backend_recent.get(key) if self.http_config.coalesce_cache_seconds > 0 else None
+        if recent is not None:
+            expires_at, resp = recent
+            if expires_at > time.monotonic():
+                return resp
+            self._backend_recent.pop(key, None)
+
+        task = self._backend_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call_backend_recorded_async(method, base_url, url, payload, auth))
+            self._backend_inflight[key] = task
+            task.add_done_callback(partial(self._finish_coalesced_call, key))
+        self._backend_waiters[task] = self._backend_waiters.get(task, 0) + 1
+        try:
+            # Shielded so one caller giving up (hedge lost, deadline) does not fail everyone sharing the call.
+            return await asyncio.shield(task)
+        finally:
+            waiters = self._backend_waiters.pop(task, 1) - 1
+            if waiters > 0:
+                self._backend_waiters[task] = waiters
+            elif not task.done():
+                # The last caller left early; stop the request rather than letting it hold a connection until timeout.
+                task.cancel()
+
+    def _finish_coalesced_call(self, key, task: asyncio.Task):
+        if self._backend_inflight.get(key) is task:
+            del self._backend_inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        resp = task.result()
+        cache_seconds = self.http_config.coalesce_cache_seconds
+        if cache_seconds <= 0 or not isinstance(resp, _BackendResponse) or resp.status_code >= 500:
+            return
+        self._backend_recent[key] = (time.monotonic() + cache_seconds, resp)
+        self._backend_recent.move_to_end(key)
+        while len(self._backend_recent) > COALESCE_CACHE_SIZE:
+            self._backend_recent.popitem(last=False)
+
+    def _url_health(self, base_url: str):
+        health = self._manage_url_health.get(base_url)
+        if health is None:
+            health = _ManageUrlHealth()
+            self._manage_url_health[base_url] = health
+        return health
+
+    def _order_urls_by_health(self, base_urls: list[str]):
+        now = time.monotonic()
+        available = [url for url in base_urls if self._url_health(url).is_available(now)]
+        # Fewest recent failures first, then configured order. Among URLs with latency samples, the faster one
+        # takes the earlier of their slots; an untried URL never moves ahead of a measured one configured before it.
+        available.sort(key=lambda url: self._url_health(url).consecutive_failures)
+        ordered = []
+        for _, group in itertools.groupby(available, key=lambda url: self._url_health(url).consecutive_failures):
+            urls = list(group)
+            measured = [idx for idx, url in enumerate(urls) if self._url_health(url).latency_ewma is not None]
+            fastest = sorted((urls[idx] for idx in measured), key=lambda url: self._url_health(url).latency_ewma)
+            for idx, url in zip(measured, fastest):
+                urls[idx] = url
+            ordered.extend(urls)
+        return ordered
+
+    def _circuit_open_message(self, method: str, base_urls: list[str]):
+        now = time.monotonic()
+        retry_in = min(
+            (max(0.0, self._url_health(url).open_until - now) for url in base_urls),
+            default=0.0,
+        )
+        return (
+            f"Failed. {method} skipped, all configured URLs are marked unhealthy."
+            f" Retrying in {math.ceil(retry_in)}s."
+        )
+
+    def _hedge_delay_seconds(self, base_url: str):
+        if self.http_config.hedge_delay_seconds > 0:
+            return self.http_config.hedge_delay_seconds
+        p95 = self._url_health(base_url).latency_p95()
+        if p95 is None:
+            return HEDGE_DEFAULT_DELAY_SECONDS
+        return min(max(p95, HEDGE_MIN_DELAY_SECONDS), self.http_config.timeout_seconds)
+
+    async def _request_backend_for_urls_async(
         self,
         req_cfg: dict,
         base_urls: list[str],
@@ -557,45 +1105,66 @@ class DASAB_SERVER_INFO_MANAGER:
         server_filter: str,
         response_processing: dict | None = None,
     ):
-        method = str(req_cfg.get("type", "GET")).upper()
-        end_pt = str(req_cfg.get("END_PT", "")).strip()
-        auth = bool(req_cfg.get("Auth", False))
-        payload = self._parse_payload(req_cfg.get("Payload"), context)
-
-        if end_pt:
-            end_pt = self._render_template(end_pt, context)
+        method, end_pt, auth, payload = self._prepare_backend_request(req_cfg, context)
 
         if not base_urls:
             return False, "Failed. No server_manage_urls configured."
 
+        healthy_urls = self._order_urls_by_health(base_urls)
+        if not healthy_urls:
+            return False, self._circuit_open_message(method, base_urls)
+
+        if self.http_config.hedge_enabled and method in HEDGE_METHODS and len(healthy_urls) > 1:
+            return await self._request_backend_hedged(
+                method, healthy_urls, end_pt, payload, auth, server_filter, response_processing
+            )
+
         last_failure_response = ""
-        for base_url in base_urls:
-            url = base_url.rstrip("/")
-            if end_pt:
-                url = f"{url}/{end_pt.lstrip('/')}"
-            resp = self._call_backend(method, url, payload, auth)
-            if isinstance(resp, Exception):
-                last_failure_response = f"Failed. {method} request failed for {url}: {resp}"
-                continue
+        for base_url in healthy_urls:
+            ok, response = await self._attempt_backend_url_async(
+                method, base_url, end_pt, payload, auth, server_filter, response_processing
+            )
+            if ok:
+                return True, response
+            if response:
+                last_failure_response = response
 
-            body = resp.text or ""
-            parsed = self._try_parse_json(body)
-            processed = self._format_response_payload(parsed, response_processing) if parsed is not None else None
+        if last_failure_response:
+            return False, last_failure_response
+        return False, f"Failed. {method} request failed for all configured URLs."
 
-            if 200 <= resp.status_code < 300:
-                if processed:
-                    return True, "Success.\n" + processed
-                formatted = self._format_server_list_payload(parsed, server_filter) if parsed is not None else None
-                if formatted:
-                    return True, formatted
-                if body:
-                    return True, "Success.\n" + body
-                return True, "Success."
+    async def _request_backend_hedged(self, method, base_urls, end_pt, payload, auth, server_filter, response_processing):
+        # Start the next URL when the current one fails or runs past its usual p95 latency;
+        # the first success wins and the remaining attempts are cancelled.
+        remaining_urls = list(base_urls)
+        running = set()
+        last_failure_response = ""
 
-            if processed:
-                last_failure_response = "Failed.\n" + processed
-            elif body:
-                last_failure_response = "Failed.\n" + body[:2000]
+        def launch_next():
+            base_url = remaining_urls.pop(0)
+            running.add(asyncio.create_task(self._attempt_backend_url_async(
+                method, base_url, end_pt, payload, auth, server_filter, response_processing
+            )))
+            return base_url
+
+        current_url = launch_next()
+        try:
+            while running:
+                timeout = self._hedge_delay_seconds(current_url) if remaining_urls else None
+                done, running = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                failed = False
+                for task in done:
+                    ok, response = task.result()
+                    if ok:
+                        return True, response
+                    failed = True
+                    if response:
+                        last_failure_response = response
+                if remaining_urls and (failed or not done):
+                    current_url = launch_next()
+        finally:
+            for task in running:
+                task.cancel()
 
         if last_failure_response:
             return False, last_failure_response
@@ -604,22 +1173,17 @@ class DASAB_SERVER_INFO_MANAGER:
     def _match_server_configs(self, server_filter: str):
         if not server_filter:
             return list(self.server_configs)
-        needle = server_filter.strip().casefold()
-        matches = []
-        for cfg in self.server_configs:
-            if needle in cfg.server_id.casefold():
-                matches.append(cfg)
-                continue
-            if cfg.server_profile and needle in cfg.server_profile.casefold():
-                matches.append(cfg)
-                continue
-            if cfg.server_name and needle in cfg.server_name.casefold():
-                matches.append(cfg)
-                continue
-            ip_port = f"{cfg.server_ip}:{cfg.server_port}" if cfg.server_ip and cfg.server_port else ""
-            if ip_port and needle in ip_port.casefold():
-                matches.append(cfg)
-        return matches
+        cache_key = server_filter.strip().casefold()
+        cached = self._match_cache.get(cache_key)
+        if cached is None:
+            indexes = self._config_match_index.substring(server_filter)
+            cached = tuple(self.server_configs[idx] for idx in indexes)
+            self._match_cache[cache_key] = cached
+            if len(self._match_cache) > MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        else:
+            self._match_cache.move_to_end(cache_key)
+        return list(cached)
 
     def _format_server_match(self, cfg: DASAB_SERVER_CONFIG):
         if not isinstance(cfg, DASAB_SERVER_CONFIG):
@@ -636,20 +1200,10 @@ class DASAB_SERVER_INFO_MANAGER:
             return primary + " (" + ", ".join(details) + ")"
         return primary
 
-    def execute_backend_req(
-        self,
-        server_filter: str,
-        backend_req: list[dict],
-        message: str | None = None,
-        response_processing: dict | None = None,
-        require_single_match: bool = False,
-    ):
-        if not backend_req:
-            return "Failed. No backend_req configured."
-
+    def _select_backend_matches(self, server_filter: str, require_single_match: bool):
         matches = self._match_server_configs(server_filter)
         if not matches:
-            return f"Failed. No server match for: {server_filter}"
+            return None, f"Failed. No server match for: {server_filter}"
         if require_single_match and len(matches) != 1:
             preview = [self._format_server_match(cfg) for cfg in matches[:10]]
             if len(matches) > 10:
@@ -658,77 +1212,291 @@ class DASAB_SERVER_INFO_MANAGER:
                 header = f"Failed. Filter '{server_filter}' matched {len(matches)} servers. Please be more specific:"
             else:
                 header = f"Failed. Command requires exactly 1 server, but matched {len(matches)}. Please specify server:"
-            return header + "\n" + "\n".join(preview)
+            return None, header + "\n" + "\n".join(preview)
+        return matches, None
+
+    async def _fan_out_backend_req(
+        self,
+        req_cfg: dict,
+        matches: list[DASAB_SERVER_CONFIG],
+        message: str | None,
+        server_filter: str,
+        response_processing: dict | None,
+        max_parallel: int,
+        timeout_seconds: float | None,
+    ):
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+        async def request_one(cfg: DASAB_SERVER_CONFIG):
+            async with semaphore:
+                context = self._build_context(cfg, message)
+                _, response = await self._request_backend_for_urls_async(
+                    req_cfg,
+                    cfg.server_manage_urls,
+                    context,
+                    server_filter,
+                    response_processing,
+                )
+                return response
+
+        tasks = [asyncio.create_task(request_one(cfg)) for cfg in matches]
+        _, pending = await asyncio.wait(tasks, timeout=timeout_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        responses = []
+        for cfg, task in zip(matches, tasks):
+            if task in pending:
+                responses.append(f"Failed. {self._format_server_match(cfg)}: no response before the command deadline.")
+            elif task.exception() is not None:
+                responses.append(f"Failed. {self._format_server_match(cfg)}: {task.exception()}")
+            else:
+                responses.append(task.result())
+        return responses
+
+    async def execute_backend_req_async(
+        self,
+        server_filter: str,
+        backend_req: list[dict],
+        message: str | None = None,
+        response_processing: dict | None = None,
+        require_single_match: bool = False,
+        max_parallel: int = 1,
+        deadline_seconds: float = 0.0,
+        invalidates_cache: bool = False,
+        priority: int = 0,
+        on_queued=None,
+    ):
+        if not backend_req:
+            return "Failed. No backend_req configured."
+
+        matches, error = self._select_backend_matches(server_filter, require_single_match)
+        if error:
+            return error
+        if server_filter:
+            self.note_server_queried(matches)
+
+        heavy = any(str(req_cfg.get("type", "GET")).upper() not in ADMISSION_LIGHT_METHODS for req_cfg in backend_req)
+        if not await self._admission.acquire(priority, heavy, on_queued):
+            return (
+                f"Failed. The server manager is busy ({self._admission.queued} requests already queued). "
+                "Please try again in a minute."
+            )
+        try:
+            return await self._run_backend_reqs_async(
+                matches,
+                backend_req,
+                message,
+                server_filter,
+                response_processing,
+                max_parallel,
+                deadline_seconds,
+                invalidates_cache,
+            )
+        finally:
+            self._admission.release()
+
+    def admission_stats(self) -> dict:
+        return self._admission.stats()
 
+    async def _run_backend_reqs_async(
+        self,
+        matches: list[DASAB_SERVER_CONFIG],
+        backend_req: list[dict],
+        message: str | None,
+        server_filter: str,
+        response_processing: dict | None,
+        max_parallel: int,
+        deadline_seconds: float,
+        invalidates_cache: bool,
+    ):
+        # The deadline starts once the command is admitted; time spent queued is not counted against it.
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline_seconds if deadline_seconds > 0 else None
         for req_cfg in backend_req:
+            remaining = None
+            if deadline_at is not None:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    return f"Failed. Command deadline of {deadline_seconds:g}s exceeded."
             if self._req_needs_server(req_cfg):
-                responses = []
-                for cfg in matches:
-                    context = self._build_context(cfg, message)
-                    ok, response = self._request_backend_for_urls(
-                        req_cfg,
-                        cfg.server_manage_urls,
-                        context,
-                        server_filter,
-                        response_processing,
-                    )
-                    if ok:
-                        responses.append(response)
-                    else:
-                        responses.append(response)
+                responses = await self._fan_out_backend_req(
+                    req_cfg,
+                    matches,
+                    message,
+                    server_filter,
+                    response_processing,
+                    max_parallel,
+                    remaining,
+                )
                 if responses:
                     success = any(resp.startswith("Success.") for resp in responses)
                     if success:
+                        if invalidates_cache:
+                            self.invalidate_servers(matches)
                         return "Success.\n" + "\n".join(responses)
             else:
                 base_urls = self._iter_manage_urls(matches)
                 context = self._build_context(matches[0], message) if matches else {}
-                ok, response = self._request_backend_for_urls(
-                    req_cfg,
-                    base_urls,
-                    context,
-                    server_filter,
-                    response_processing,
-                )
+                try:
+                    ok, response = await asyncio.wait_for(
+                        self._request_backend_for_urls_async(
+                            req_cfg,
+                            base_urls,
+                            context,
+                            server_filter,
+                            response_processing,
+                        ),
+                        timeout=remaining,
+                    )
+                except asyncio.TimeoutError:
+                    return f"Failed. Command deadline of {deadline_seconds:g}s exceeded."
                 if ok:
+                    if invalidates_cache:
+                        self.invalidate_servers(matches)
                     return response
 
         return "Failed. All backend_req attempts failed."
 
-    def get_server_info(self, server_id = ""):
-        url = f"https://api.battlemetrics.com/servers/{server_id}"
+    def _build_server_info(self, server_id, data):
+        server = DASAB_SERVER_INFO(
+            server_id,
+            data,
+            self.display_template,
+            self.display_fields,
+            renderer=self._display_renderer,
+        )
+        server.config = self._find_config_for_info(server)
+        return server
+
+    def _fetch_server_info(self, server_id):
+        url = f"{BATTLEMETRICS_SERVERS_URL}/{server_id}"
         try:
-            response = requests.get(url)
-            message = ""
+            response = self._http_session.get(url, timeout=self.http_config.timeout)
             if response.status_code == 200:
-                data = response.json()
-                server = DASAB_SERVER_INFO(
-                    server_id,
-                    data,
-                    self.display_template,
-                    self.display_fields,
-                )
-                server.config = self._find_config_for_info(server)
-                self.server_info_list.append(server)
-                message += server.str_info
-            else:
-                message += f"Failed to retrieve data for server_id={server_id}" 
-                print(f"Failed to retrieve data for server_id={server_id}, status_code = {response.status_code}") 
+                server = self._build_server_info(server_id, response.json())
+                return server, server.str_info
+            print(f"Failed to retrieve data for server_id={server_id}, status_code = {response.status_code}")
+            return None, f"Failed to retrieve data for server_id={server_id}"
+        except Exception as e:
+            print(f"Error while receiving data for server_id={server_id}, {e}")
+            return None, f"Error while receiving data for server_id={server_id}"
+
+    async def _fetch_server_info_async(self, server_id):
+        url = f"{BATTLEMETRICS_SERVERS_URL}/{server_id}"
+        try:
+            async with self._get_async_session().get(url) as response:
+                if response.status == 200:
+                    server = self._build_server_info(server_id, await response.json(content_type=None))
+                    return server, server.str_info
+                print(f"Failed to retrieve data for server_id={server_id}, status_code = {response.status}")
+                return None, f"Failed to retrieve data for server_id={server_id}"
         except Exception as e:
-            message += f"Error while receiving data for server_id={server_id}" 
+            if isinstance(e, asyncio.TimeoutError):
+                e = TimeoutError(f"timed out after {self.http_config.timeout_seconds}s")
             print(f"Error while receiving data for server_id={server_id}, {e}")
+            return None, f"Error while receiving data for server_id={server_id}"
+
+    def get_server_info(self, server_id = ""):
+        server, message = self._fetch_server_info(server_id)
+        if server is not None:
+            self.server_info_list.append(server)
         return message
-    
-    def repopulate_all_server_list(self):
-        self.server_info_list = [] # clearing old list
-        server_info_str = ""
+
+    def _refresh_server_ids(self):
+        server_ids = []
         for server_cfg in self.server_configs:
             server_id = self._extract_server_id(server_cfg)
-            if not server_id:
-                continue
-            server_info_str += self.get_server_info(server_id) + "\n" # this also populates server_info_list
-        return server_info_str
-    
+            if server_id:
+                server_ids.append(server_id)
+        return server_ids
+
+    def _failed_server_info(self, server_id, previous: DASAB_SERVER_INFO | None):
+        # A failed lookup keeps the last good record for a while, then the server is listed as unreachable.
+        max_age = self.refresh_config.offline_interval_seconds
+        if previous is not None and not previous.is_unreachable and time.time() - previous.fetched_at <= max_age:
+            return previous
+        name = previous.name if previous is not None else ""
+        if not name:
+            cfg = self._config_by_id.get(self._normalize_id(server_id))
+            name = (cfg.server_name or cfg.server_profile) if cfg is not None else ""
+        server = DASAB_SERVER_INFO.unreachable(
+            server_id,
+            name or str(server_id),
+            previous.fetched_at if previous is not None else 0.0,
+        )
+        server.config = self._find_config_for_info(server)
+        return server
+
+    def _publish_server_infos(self, server_ids, results):
+        previous = {str(info.id): info for info in self.server_info_list}
+        infos = []
+        now = time.monotonic()
+        for server_id, (server, _) in zip(server_ids, results):
+            self._refresh_schedule.record(server_id, server, now)
+            if server is None:
+                server = self._failed_server_info(server_id, previous.get(str(server_id)))
+            infos.append(server)
+        self.server_info_list = infos
+        return "".join(server.str_info + "\n" for server in infos)
+
+    def repopulate_all_server_list(self):
+        server_ids = self._refresh_server_ids()
+        if not server_ids:
+            return self._publish_server_infos([], [])
+        workers = min(self.refresh_config.max_parallel, len(server_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._fetch_server_info, server_ids))
+        return self._publish_server_infos(server_ids, results)
+
+    async def _fetch_server_infos_async(self, server_ids):
+        semaphore = asyncio.Semaphore(self.refresh_config.max_parallel)
+
+        async def fetch_one(server_id):
+            async with semaphore:
+                return await self._fetch_server_info_async(server_id)
+
+        tasks = [asyncio.create_task(fetch_one(server_id)) for server_id in server_ids]
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.refresh_config.deadline_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            print(f"Server list refresh deadline hit, {len(pending)} of {len(tasks)} servers kept previous data")
+
+        results = []
+        for server_id, task in zip(server_ids, tasks):
+            if task in pending or task.exception() is not None:
+                results.append((None, f"Error while receiving data for server_id={server_id}"))
+            else:
+                results.append(task.result())
+        return results
+
+    def _merge_server_infos(self, server_ids, results):
+        # Only some servers were re-fetched: replace their records and keep every other server as it was.
+        now = time.monotonic()
+        previous = {str(info.id): info for info in self.server_info_list}
+        refreshed = {}
+        fetched = 0
+        for server_id, (server, _) in zip(server_ids, results):
+            self._refresh_schedule.record(server_id, server, now)
+            if server is not None:
+                fetched += 1
+            else:
+                server = self._failed_server_info(server_id, previous.get(str(server_id)))
+            refreshed[str(server_id)] = server
+        infos = []
+        for server_id in self._refresh_server_ids():
+            server = refreshed.get(str(server_id)) or previous.get(str(server_id))
+            if server is not None:
+                infos.append(server)
+        self.server_info_list = infos
+        return fetched
+
     def get_server_list(self, server_filter=""):
         info = self.get_only_server_list(server_filter)
         server_info = ""
@@ -747,79 +1515,246 @@ class DASAB_SERVER_INFO_MANAGER:
                     server_info += server.str_info + "\n"
         return server_info
 
-    def extract_server_names(self, server_info: str) -> list[str]:
-        names = []
-        seen = set()
-        for line in server_info.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            lowered = line.lower()
-            if lowered.startswith("success") or lowered.startswith("fail"):
-                continue
-            if line.startswith(">"):
-                line = line[1:].strip()
-            name = line.split(" | ", 1)[0].strip()
-            if name and name not in seen:
-                seen.add(name)
-                names.append(name)
-        return names
-
     def is_cache_stale(self, now: float | None = None) -> bool:
         if now is None:
             now = time.monotonic()
         return (now - self._cache["ts"]) > self._cache_ttl_seconds
 
     def is_cache_refreshing(self) -> bool:
-        return self._cache["refreshing"]
+        task = self._cache_refresh_task
+        return task is not None and not task.done()
 
-    async def refresh_server_list_cache(self) -> None:
-        if self._cache["refreshing"]:
+    def cache_age_seconds(self, now: float | None = None) -> float | None:
+        if not self._cache["ts"]:
+            return None
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, now - self._cache["ts"])
+
+    def _refresh_if_stale(self, now: float | None = None):
+        # Once the refresh loop runs, the per-server schedule (backoff, budget) decides what is re-fetched.
+        if not self._refresh_loop_running and self.is_cache_stale(now):
+            self.start_cache_refresh()
+
+    def start_cache_refresh(self) -> asyncio.Task:
+        task = self._cache_refresh_task
+        if task is None or task.done() or self._cache_refresh_generation != self._cache_generation:
+            self._cache_refresh_generation = self._cache_generation
+            task = asyncio.create_task(self._refresh_server_list_cache_once(self._cache_generation))
+            self._cache_refresh_task = task
+        return task
+
+    async def _refresh_server_list_cache_once(self, generation: int) -> bool:
+        server_ids = self._refresh_server_ids()
+        try:
+            results = await self._fetch_server_infos_async(server_ids)
+        except Exception as e:
+            print(f"Error refreshing server list cache: {e}")
+            return False
+        # Configs were reloaded while fetching: these records belong to the old configs, so drop them untouched.
+        if generation != self._cache_generation:
+            return False
+        self._publish_server_infos(server_ids, results)
+        await self._publish_cache_snapshot(save_now=True)
+        return True
+
+    async def _publish_cache_snapshot(self, save_now: bool = False):
+        now = time.monotonic()
+        # The cache is as old as its oldest live record; a tick that re-fetched one server does not make the rest fresh.
+        wall_now = time.time()
+        oldest_age = max(
+            (wall_now - server.fetched_at for server in self.server_info_list if not server.is_unreachable),
+            default=0.0,
+        )
+        ts = now - max(0.0, oldest_age)
+        previous = {id(server) for server in self._cache["snapshot"].servers}
+        snapshot = DASAB_SERVER_SNAPSHOT.from_infos(self.server_info_list, ts)
+        snapshot.search_index  # build the autocomplete index off the keystroke path
+        self._cache["snapshot"] = snapshot
+        self._cache["ts"] = ts
+        # Only persist when something was actually re-fetched; kept records would be written out unchanged.
+        if any(id(server) not in previous for server in snapshot.servers):
+            self._snapshot_dirty = True
+        # Scheduler ticks re-fetch a few servers every few seconds; batch those into one write per interval.
+        if save_now or now - self._snapshot_saved_at >= SERVER_SNAPSHOT_SAVE_INTERVAL_SECONDS:
+            await self._flush_cached_snapshot()
+
+    async def _flush_cached_snapshot(self):
+        if not self._snapshot_dirty:
             return
-        self._cache["refreshing"] = True
+        self._snapshot_dirty = False
+        self._snapshot_saved_at = time.monotonic()
+        snapshot = self._cache["snapshot"]
+        if not await asyncio.to_thread(self._save_cached_snapshot, snapshot, self._display_renderer.fingerprint):
+            self._snapshot_dirty = True
+
+    async def refresh_due_servers(self) -> int:
+        if self.is_cache_refreshing():
+            return 0
+        return await self.refresh_servers(self._refresh_schedule.take_due(self._refresh_server_ids(), time.monotonic()))
+
+    async def refresh_servers(self, server_ids) -> int:
+        if not server_ids:
+            return 0
+        generation = self._cache_generation
         try:
-            data = await asyncio.to_thread(self.get_only_server_list, "")
-            self._cache["data"] = data or ""
-            self._cache["ts"] = time.monotonic()
-        finally:
-            self._cache["refreshing"] = False
+            results = await self._fetch_server_infos_async(server_ids)
+        except Exception as e:
+            print(f"Error refreshing servers {server_ids}: {e}")
+            return 0
+        if generation != self._cache_generation:
+            return 0
+        refreshed = self._merge_server_infos(server_ids, results)
+        await self._publish_cache_snapshot()
+        return refreshed
+
+    def invalidate_servers(self, servers):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        now = time.monotonic()
+        for server in servers:
+            server_id = server.id if isinstance(server, DASAB_SERVER_INFO) else self._extract_server_id(server)
+            if not server_id:
+                continue
+            key = str(server_id)
+            previous = self._follow_ups.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+            self._refresh_schedule.touch(server_id, now)
+            task = asyncio.create_task(self._follow_up_server(server_id))
+            self._follow_ups[key] = task
+            task.add_done_callback(partial(self._finish_follow_up, key))
+
+    async def _follow_up_server(self, server_id):
+        # Poll just this server until it has left the status it had when the command ran and landed on a stable one.
+        initial_status = self._cached_status(server_id)
+        settled_statuses = _RefreshSchedule.STABLE_STATUSES + _RefreshSchedule.OFFLINE_STATUSES
+        for delay in self.refresh_config.follow_up_seconds:
+            await asyncio.sleep(delay)
+            await self.refresh_servers([server_id])
+            status = self._cached_status(server_id)
+            if status != initial_status and status in settled_statuses:
+                return
+
+    def _finish_follow_up(self, key, task: asyncio.Task):
+        if self._follow_ups.get(key) is task:
+            del self._follow_ups[key]
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error polling server_id={key} after command: {task.exception()}")
+
+    def _cached_status(self, server_id) -> str:
+        for server in self.server_info_list:
+            if str(server.id) == str(server_id):
+                return str(server.status or "").strip().casefold()
+        return ""
 
-    async def get_autocomplete_names(self, current: str, limit: int = 25) -> list[str]:
+    def note_server_queried(self, servers):
         now = time.monotonic()
-        if self.is_cache_stale(now) and not self.is_cache_refreshing():
-            asyncio.create_task(self.refresh_server_list_cache())
-        data = self.get_cached_only_server_list()
-        if not data.strip():
+        for server in servers:
+            server_id = server.id if isinstance(server, DASAB_SERVER_INFO) else self._extract_server_id(server)
+            if server_id:
+                self._refresh_schedule.touch(server_id, now)
+
+    def _load_cached_snapshot(self, filename: str = SERVER_SNAPSHOT_PATH) -> bool:
+        if not os.path.exists(filename):
+            return False
+        try:
+            with open(filename, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except Exception as e:
+            print(f"Error reading server snapshot '{filename}': {e}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != SERVER_SNAPSHOT_VERSION:
+            return False
+        if data.get("display_fingerprint") != self._display_renderer.fingerprint:
+            print(f"Ignoring server snapshot '{filename}': display_template/display_fields changed since it was saved.")
+            return False
+        records = data.get("servers")
+        if not isinstance(records, list):
+            return False
+
+        # Each record carries its own wall-clock fetched_at: a save after a partial re-fetch must not make the
+        # records it merely kept look fresh.
+        wall_now = time.time()
+        infos = []
+        age = 0.0
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            server = DASAB_SERVER_INFO.from_record(record)
+            record_age = wall_now - server.fetched_at
+            if not server.str_info or record_age < 0 or record_age > SERVER_SNAPSHOT_MAX_AGE_SECONDS:
+                continue
+            server.config = self._find_config_for_info(server)
+            infos.append(server)
+            if not server.is_unreachable:
+                age = max(age, record_age)
+        if not infos:
+            return False
+
+        # fetched_at is wall-clock; the cache runs on the monotonic clock, so carry the oldest age across instead.
+        created_at = time.monotonic() - age
+        snapshot = DASAB_SERVER_SNAPSHOT.from_infos(infos, created_at)
+        self.server_info_list = list(snapshot.servers)
+        self._cache = {"ts": created_at, "snapshot": snapshot}
+        print(f"Loaded {len(infos)} cached servers from '{filename}' ({_format_age(age)} old)")
+        return True
+
+    def _save_cached_snapshot(self, snapshot: DASAB_SERVER_SNAPSHOT, display_fingerprint: str, filename: str = SERVER_SNAPSHOT_PATH) -> bool:
+        data = {
+            "version": SERVER_SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "display_fingerprint": display_fingerprint,
+            "servers": [server.to_record() for server in snapshot.servers],
+        }
+        tmp_filename = f"{filename}.tmp"
+        try:
+            with open(tmp_filename, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, ensure_ascii=False, default=str)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_filename, filename)
+        except Exception as e:
+            print(f"Error writing server snapshot '{filename}': {e}")
+            return False
+        return True
+
+    async def refresh_server_list_cache(self) -> bool:
+        # Every caller shares the one in-flight refresh; shield it so a cancelled caller does not cancel it for the rest.
+        return await asyncio.shield(self.start_cache_refresh())
+
+    async def get_autocomplete_names(self, current: str, limit: int = 25) -> list[str]:
+        snapshot = self.get_cached_snapshot()
+        if not snapshot:
             await self.refresh_server_list_cache()
-            data = self.get_cached_only_server_list()
-        if not data:
+            snapshot = self.get_cached_snapshot()
+        else:
+            self._refresh_if_stale()
+        if not snapshot:
             return []
-        current_lower = current.lower()
-        names = []
-        for name in self.extract_server_names(data):
-            if current_lower in name.lower():
-                names.append(name)
-                if len(names) >= limit:
-                    break
-        return names
+        return snapshot.autocomplete(current, limit)
 
-    async def run_cache_refresh_loop(self, interval_seconds: int = 180) -> None:
-        while True:
-            try:
-                await self.refresh_server_list_cache()
-            except Exception as e:
-                print(f"Error refreshing server list cache: {e}")
-            await asyncio.sleep(interval_seconds)
+    async def run_cache_refresh_loop(self) -> None:
+        if not self.get_cached_snapshot() or self.is_cache_stale():
+            await self.refresh_server_list_cache()
+        self._refresh_loop_running = True
+        try:
+            while True:
+                await asyncio.sleep(self.refresh_config.tick_seconds)
+                try:
+                    await self.refresh_due_servers()
+                except Exception as e:
+                    print(f"Error refreshing server list cache: {e}")
+        finally:
+            self._refresh_loop_running = False
+
+    def get_cached_snapshot(self) -> DASAB_SERVER_SNAPSHOT:
+        return self._cache["snapshot"]
 
     def get_cached_only_server_list(self, server_filter=""):
-        server_info = self._cache["data"] or ""
-        if server_filter:
-            lines = [
-                line for line in server_info.splitlines()
-                if server_filter.lower() in line.lower()
-            ]
-            return "\n".join(lines) + ("\n" if lines else "")
-        return server_info
+        return self.get_cached_snapshot().render(server_filter)
 
     def get_cached_server_list(self, server_filter=""):
         info = self.get_cached_only_server_list(server_filter)
@@ -830,11 +1765,21 @@ class DASAB_SERVER_INFO_MANAGER:
             header = f"Success. Here is list of servers containing {server_filter} : \n"
         else:
             header = "Success. Here is full server list: \n"
-        return header + info + "\nDone listing servers"
+        footer = "\nDone listing servers"
+        age = self.cache_age_seconds()
+        if age is not None and age > self._cache_ttl_seconds:
+            state = ", refresh in progress" if self.is_cache_refreshing() else ""
+            footer += f" (data from {_format_age(age)} ago{state})"
+        return header + info + footer
 
     async def get_cached_server_list_async(self, server_filter=""):
-        if (self.is_cache_stale() and not self.is_cache_refreshing()) or not self.get_cached_only_server_list().strip():
+        if not self.get_cached_snapshot():
+            # Nothing to serve yet: wait for the shared refresh instead of answering "No cached servers".
             await self.refresh_server_list_cache()
+        else:
+            self._refresh_if_stale()
+        if server_filter:
+            self.note_server_queried(self.get_cached_snapshot().filter(server_filter))
         return self.get_cached_server_list(server_filter)
     
     # old function for reference
@@ -9,10 +9,38 @@ DEFAULT_DISPLAY_FIELDS = {
     "maxPlayers": "maxPlayers",
     "day": "time_i",
 }
+DEFAULT_HTTP_TIMEOUT_SECONDS = 10
+DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS = 3
+DEFAULT_HTTP_POOL_CONNECTIONS = 10
+DEFAULT_HTTP_POOL_MAXSIZE = 20
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 3
+DEFAULT_CIRCUIT_COOLDOWN_SECONDS = 30
+DEFAULT_MAX_CONCURRENT_COMMANDS = 8
+DEFAULT_MAX_QUEUED_COMMANDS = 100
+DEFAULT_REFRESH_MAX_PARALLEL = 10
+DEFAULT_REFRESH_DEADLINE_SECONDS = 30
+DEFAULT_REFRESH_HOT_INTERVAL_SECONDS = 60
+DEFAULT_REFRESH_IDLE_INTERVAL_SECONDS = 300
+DEFAULT_REFRESH_OFFLINE_INTERVAL_SECONDS = 900
+DEFAULT_REFRESH_HOT_WINDOW_SECONDS = 600
+DEFAULT_REFRESH_JITTER_RATIO = 0.2
+DEFAULT_REFRESH_BUDGET_PER_MINUTE = 60
+DEFAULT_REFRESH_TICK_SECONDS = 5
+DEFAULT_REFRESH_FOLLOW_UP_SECONDS = (5, 15, 30, 60, 120)
+import hashlib
+import json
+import re
+import time
+from bisect import bisect_left
+from heapq import nsmallest
 from dataclasses import dataclass, field
+from functools import cached_property
 from string import Formatter
 
-_MISSING = object()
+from DASAB_templates import MISSING as _MISSING, PayloadLookup, compile_field_candidates
+
+_SEARCH_TOKEN_SPLIT = re.compile(r"[^\w]+")
+_SEARCH_GRAM_SIZE = 3
 
 
 class _SafeFormatDict(dict):
@@ -26,65 +54,14 @@ class _ValueExtractor:
         return "" if value is None else str(value)
 
     @staticmethod
-    def _normalize_segment(value):
-        return str(value).strip().casefold()
-
-    @staticmethod
-    def _normalize_path(candidate):
-        if candidate is None:
-            return ""
-        parts = [part for part in str(candidate).strip().split(".") if part.strip()]
-        return ".".join(_ValueExtractor._normalize_segment(part) for part in parts)
-
-    @staticmethod
-    def build_index(obj, index=None, path=None):
-        if index is None:
-            index = {"by_key": {}, "by_path": {}}
-        if path is None:
-            path = []
-
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                key_norm = _ValueExtractor._normalize_segment(key)
-                current_path = [*path, key_norm]
-                path_key = ".".join(current_path)
-                if value is not None:
-                    index["by_key"].setdefault(key_norm, value)
-                    index["by_path"].setdefault(path_key, value)
-                _ValueExtractor.build_index(value, index, current_path)
-        elif isinstance(obj, list):
-            for idx, item in enumerate(obj):
-                current_path = [*path, str(idx)]
-                path_key = ".".join(current_path)
-                if item is not None:
-                    index["by_path"].setdefault(path_key, item)
-                _ValueExtractor.build_index(item, index, current_path)
-        return index
-
-    @staticmethod
-    def _resolve_candidate(candidate, primary_index, secondary_index):
-        if candidate is None:
-            return _MISSING
-
-        candidate_str = str(candidate).strip()
-        if not candidate_str:
-            return _MISSING
-
-        normalized_key = _ValueExtractor._normalize_segment(candidate_str)
-        normalized_path = _ValueExtractor._normalize_path(candidate_str)
-
-        for index in (primary_index, secondary_index):
-            if index is None:
-                continue
-            by_path = index.get("by_path", {})
-            by_key = index.get("by_key", {})
-            if normalized_path and normalized_path in by_path:
-                value = by_path[normalized_path]
-                if value is not None:
+    def resolve(candidates, primary_lookup, secondary_lookup):
+        for normalized_path, normalized_key in candidates:
+            for lookup in (primary_lookup, secondary_lookup):
+                value = lookup.by_path(normalized_path)
+                if value is not _MISSING:
                     return value
-            if normalized_key in by_key:
-                value = by_key[normalized_key]
-                if value is not None:
+                value = lookup.by_key(normalized_key)
+                if value is not _MISSING:
                     return value
         return _MISSING
 
@@ -138,7 +115,168 @@ class DASAB_SERVER_CONFIG:
         )
 
 
+def _positive_float(value, default):
+    try:
+        parsed = float(value)
+    except Exception:
+        return default
+    return parsed if parsed > 0 else default
+
+
+def _non_negative_float(value, default):
+    try:
+        parsed = float(value)
+    except Exception:
+        return default
+    return parsed if parsed >= 0 else default
+
+
+def _positive_float_tuple(value, default):
+    if not isinstance(value, list):
+        return default
+    parsed = tuple(item for item in (_positive_float(item, None) for item in value) if item is not None)
+    return parsed if parsed else default
+
+
+def _positive_int(value, default):
+    try:
+        parsed = int(value)
+    except Exception:
+        return default
+    return parsed if parsed > 0 else default
+
+
+@dataclass(frozen=True, slots=True)
+class DASAB_HTTP_CONFIG:
+    timeout_seconds: float = DEFAULT_HTTP_TIMEOUT_SECONDS
+    connect_timeout_seconds: float = DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS
+    pool_connections: int = DEFAULT_HTTP_POOL_CONNECTIONS
+    pool_maxsize: int = DEFAULT_HTTP_POOL_MAXSIZE
+    pool_block: bool = False
+    hedge_enabled: bool = False
+    hedge_delay_seconds: float = 0.0
+    circuit_failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD
+    circuit_cooldown_seconds: float = DEFAULT_CIRCUIT_COOLDOWN_SECONDS
+    coalesce_cache_seconds: float = 0.0
+    max_concurrent_commands: int = DEFAULT_MAX_CONCURRENT_COMMANDS
+    max_queued_commands: int = DEFAULT_MAX_QUEUED_COMMANDS
+
+    @classmethod
+    def from_dict(cls, data: dict | None):
+        if not isinstance(data, dict):
+            return cls()
+        timeout_seconds = _positive_float(data.get("timeout_seconds"), DEFAULT_HTTP_TIMEOUT_SECONDS)
+        connect_timeout_seconds = _positive_float(
+            data.get("connect_timeout_seconds"),
+            min(DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS, timeout_seconds),
+        )
+        return cls(
+            timeout_seconds=timeout_seconds,
+            connect_timeout_seconds=connect_timeout_seconds,
+            pool_connections=_positive_int(data.get("pool_connections"), DEFAULT_HTTP_POOL_CONNECTIONS),
+            pool_maxsize=_positive_int(data.get("pool_maxsize"), DEFAULT_HTTP_POOL_MAXSIZE),
+            pool_block=bool(data.get("pool_block", False)),
+            hedge_enabled=bool(data.get("hedge_enabled", False)),
+            hedge_delay_seconds=_positive_float(data.get("hedge_delay_seconds"), 0.0),
+            circuit_failure_threshold=_positive_int(
+                data.get("circuit_failure_threshold"),
+                DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+            ),
+            circuit_cooldown_seconds=_positive_float(
+                data.get("circuit_cooldown_seconds"),
+                DEFAULT_CIRCUIT_COOLDOWN_SECONDS,
+            ),
+            coalesce_cache_seconds=_positive_float(data.get("coalesce_cache_seconds"), 0.0),
+            max_concurrent_commands=_positive_int(data.get("max_concurrent_commands"), DEFAULT_MAX_CONCURRENT_COMMANDS),
+            max_queued_commands=_positive_int(data.get("max_queued_commands"), DEFAULT_MAX_QUEUED_COMMANDS),
+        )
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout_seconds, self.timeout_seconds)
+
+
+@dataclass(frozen=True, slots=True)
+class DASAB_REFRESH_CONFIG:
+    max_parallel: int = DEFAULT_REFRESH_MAX_PARALLEL
+    deadline_seconds: float = DEFAULT_REFRESH_DEADLINE_SECONDS
+    hot_interval_seconds: float = DEFAULT_REFRESH_HOT_INTERVAL_SECONDS
+    idle_interval_seconds: float = DEFAULT_REFRESH_IDLE_INTERVAL_SECONDS
+    offline_interval_seconds: float = DEFAULT_REFRESH_OFFLINE_INTERVAL_SECONDS
+    hot_window_seconds: float = DEFAULT_REFRESH_HOT_WINDOW_SECONDS
+    jitter_ratio: float = DEFAULT_REFRESH_JITTER_RATIO
+    budget_per_minute: int = DEFAULT_REFRESH_BUDGET_PER_MINUTE
+    tick_seconds: float = DEFAULT_REFRESH_TICK_SECONDS
+    follow_up_seconds: tuple[float, ...] = DEFAULT_REFRESH_FOLLOW_UP_SECONDS
+
+    @classmethod
+    def from_dict(cls, data: dict | None):
+        if not isinstance(data, dict):
+            return cls()
+        hot_interval_seconds = _positive_float(data.get("hot_interval_seconds"), DEFAULT_REFRESH_HOT_INTERVAL_SECONDS)
+        idle_interval_seconds = max(
+            hot_interval_seconds,
+            _positive_float(data.get("idle_interval_seconds"), DEFAULT_REFRESH_IDLE_INTERVAL_SECONDS),
+        )
+        return cls(
+            max_parallel=_positive_int(data.get("max_parallel"), DEFAULT_REFRESH_MAX_PARALLEL),
+            deadline_seconds=_positive_float(data.get("deadline_seconds"), DEFAULT_REFRESH_DEADLINE_SECONDS),
+            hot_interval_seconds=hot_interval_seconds,
+            idle_interval_seconds=idle_interval_seconds,
+            offline_interval_seconds=max(
+                idle_interval_seconds,
+                _positive_float(data.get("offline_interval_seconds"), DEFAULT_REFRESH_OFFLINE_INTERVAL_SECONDS),
+            ),
+            hot_window_seconds=_positive_float(data.get("hot_window_seconds"), DEFAULT_REFRESH_HOT_WINDOW_SECONDS),
+            jitter_ratio=min(_non_negative_float(data.get("jitter_ratio"), DEFAULT_REFRESH_JITTER_RATIO), 0.5),
+            budget_per_minute=_positive_int(data.get("budget_per_minute"), DEFAULT_REFRESH_BUDGET_PER_MINUTE),
+            tick_seconds=_positive_float(data.get("tick_seconds"), DEFAULT_REFRESH_TICK_SECONDS),
+            follow_up_seconds=_positive_float_tuple(data.get("follow_up_seconds"), DEFAULT_REFRESH_FOLLOW_UP_SECONDS),
+        )
+
+
+class DisplayRenderer:
+    """display_template/display_fields compiled once; reused for every server until the config is reloaded."""
+
+    __slots__ = ("template", "fingerprint", "_fields")
+
+    def __init__(self, display_template: str = DEFAULT_DISPLAY_TEMPLATE, display_fields: dict | None = None):
+        self.template = display_template or DEFAULT_DISPLAY_TEMPLATE
+        field_map = dict(display_fields) if isinstance(display_fields, dict) else dict(DEFAULT_DISPLAY_FIELDS)
+        for _, field_name, _, _ in Formatter().parse(self.template):
+            if field_name and field_name not in field_map:
+                field_map[field_name] = field_name
+        self._fields = tuple(
+            (placeholder, compile_field_candidates(placeholder, key))
+            for placeholder, key in field_map.items()
+        )
+        # Identifies the rendered output format, so lines saved under another template/fields are not reused.
+        self.fingerprint = hashlib.sha1(
+            json.dumps([self.template, self._fields], sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def values(self, data):
+        root = data
+        if isinstance(data, dict):
+            data_obj = data.get("data")
+            if isinstance(data_obj, dict):
+                attributes = data_obj.get("attributes")
+                if isinstance(attributes, dict):
+                    root = attributes
+
+        root_lookup = PayloadLookup(root)
+        data_lookup = PayloadLookup(data) if root is not data else root_lookup
+        values = _SafeFormatDict()
+        for placeholder, candidates in self._fields:
+            value = _ValueExtractor.resolve(candidates, root_lookup, data_lookup)
+            values[placeholder] = "" if value is _MISSING else value
+        return values
+
+
 class DASAB_SERVER_INFO:
+    RECORD_FIELDS = ("id", "name", "status", "ip", "port", "map", "player", "maxPlayer", "days", "str_info")
+    UNREACHABLE_STATUS = "unreachable"
+
     __slots__ = (
         "id",
         "name",
@@ -151,6 +289,7 @@ class DASAB_SERVER_INFO:
         "days",
         "str_info",
         "config",
+        "fetched_at",
     )
 
     def __init__(
@@ -159,37 +298,13 @@ class DASAB_SERVER_INFO:
         data,
         display_template: str = DEFAULT_DISPLAY_TEMPLATE,
         display_fields: dict | None = None,
+        renderer: DisplayRenderer | None = None,
     ):
-        template = display_template or DEFAULT_DISPLAY_TEMPLATE
-        root = data
-        if isinstance(data, dict):
-            data_obj = data.get("data")
-            if isinstance(data_obj, dict):
-                attributes = data_obj.get("attributes")
-                if isinstance(attributes, dict):
-                    root = attributes
+        if renderer is None:
+            renderer = DisplayRenderer(display_template, display_fields)
+        values = renderer.values(data)
 
-        field_map = dict(display_fields) if isinstance(display_fields, dict) else dict(DEFAULT_DISPLAY_FIELDS)
-        for _, field_name, _, _ in Formatter().parse(template):
-            if field_name and field_name not in field_map:
-                field_map[field_name] = field_name
-
-        root_index = _ValueExtractor.build_index(root)
-        data_index = _ValueExtractor.build_index(data) if root is not data else root_index
-        values = _SafeFormatDict()
-
-        for placeholder, key in field_map.items():
-            candidates = list(key) if isinstance(key, list) else [key]
-            if not any(str(candidate).strip() == placeholder for candidate in candidates):
-                candidates.append(placeholder)
-            value = _MISSING
-            for candidate in candidates:
-                value = _ValueExtractor._resolve_candidate(candidate, root_index, data_index)
-                if value is not _MISSING:
-                    break
-            values[placeholder] = "" if value is _MISSING else value
-
-        self.str_info = template.format_map(values)
+        self.str_info = renderer.template.format_map(values)
 
         self.id = server_id
         self.name = _ValueExtractor.coerce_str(values.get("name", ""))
@@ -201,3 +316,207 @@ class DASAB_SERVER_INFO:
         self.maxPlayer = _ValueExtractor.coerce_str(values.get("maxPlayers", ""))
         self.days = _ValueExtractor.coerce_str(values.get("day", ""))
         self.config = None
+        self.fetched_at = time.time()
+
+    def to_record(self) -> dict:
+        record = {name: getattr(self, name) for name in self.RECORD_FIELDS}
+        record["fetched_at"] = self.fetched_at
+        return record
+
+    @classmethod
+    def from_record(cls, record: dict):
+        server = cls.__new__(cls)
+        for name in cls.RECORD_FIELDS:
+            value = record.get(name, "")
+            setattr(server, name, value if name == "id" else _ValueExtractor.coerce_str(value))
+        server.config = None
+        try:
+            server.fetched_at = float(record.get("fetched_at") or 0.0)
+        except (TypeError, ValueError):
+            server.fetched_at = 0.0
+        return server
+
+    @classmethod
+    def unreachable(cls, server_id, name: str, fetched_at: float = 0.0):
+        """Stands in for a server whose lookups keep failing, so it stays listed without claiming a live status."""
+        server = cls.from_record({"id": server_id, "name": name, "status": cls.UNREACHABLE_STATUS})
+        last_data = time.strftime("%Y-%m-%d %H:%M", time.localtime(fetched_at)) if fetched_at else "never"
+        server.str_info = f"> {name} | {cls.UNREACHABLE_STATUS} | last data: {last_data}"
+        server.fetched_at = fetched_at
+        return server
+
+    @property
+    def is_unreachable(self) -> bool:
+        return self.status == self.UNREACHABLE_STATUS
+
+
+class DASAB_SEARCH_INDEX:
+    """Casefolded exact/prefix/token/substring lookups over entries that each carry several keys."""
+
+    __slots__ = ("size", "_keys", "_exact", "_sorted_keys", "_sorted_tokens", "_grams")
+
+    def __init__(self, entry_keys):
+        self._keys = []
+        self._exact = {}
+        sorted_keys = []
+        sorted_tokens = []
+        self._grams = {}
+        for idx, keys in enumerate(entry_keys):
+            folded = []
+            for key in keys:
+                text = str(key).strip().casefold() if key is not None else ""
+                if text and text not in folded:
+                    folded.append(text)
+            self._keys.append(tuple(folded))
+            for text in folded:
+                self._exact.setdefault(text, []).append(idx)
+                sorted_keys.append((text, idx))
+                for token in _SEARCH_TOKEN_SPLIT.split(text):
+                    if token and token != text:
+                        sorted_tokens.append((token, idx))
+                for pos in range(len(text) - _SEARCH_GRAM_SIZE + 1):
+                    self._grams.setdefault(text[pos:pos + _SEARCH_GRAM_SIZE], set()).add(idx)
+        sorted_keys.sort()
+        sorted_tokens.sort()
+        self._sorted_keys = sorted_keys
+        self._sorted_tokens = sorted_tokens
+        self.size = len(self._keys)
+
+    @staticmethod
+    def _prefix_scan(sorted_pairs, needle):
+        hits = set()
+        pos = bisect_left(sorted_pairs, (needle, -1))
+        while pos < len(sorted_pairs) and sorted_pairs[pos][0].startswith(needle):
+            hits.add(sorted_pairs[pos][1])
+            pos += 1
+        return hits
+
+    @staticmethod
+    def _first(hits, limit):
+        if limit is None or len(hits) <= limit:
+            return sorted(hits)
+        return nsmallest(limit, hits)
+
+    def exact(self, query: str, limit: int | None = None) -> list[int]:
+        return self._first(self._exact.get(query.strip().casefold(), ()), limit)
+
+    def prefix(self, query: str, limit: int | None = None) -> list[int]:
+        return self._first(self._prefix_scan(self._sorted_keys, query.strip().casefold()), limit)
+
+    def token_prefix(self, query: str, limit: int | None = None) -> list[int]:
+        return self._first(self._prefix_scan(self._sorted_tokens, query.strip().casefold()), limit)
+
+    def substring(self, query: str, limit: int | None = None) -> list[int]:
+        needle = query.strip().casefold()
+        if not needle:
+            return list(range(self.size if limit is None else min(limit, self.size)))
+        if len(needle) < _SEARCH_GRAM_SIZE:
+            candidates = range(self.size)
+        else:
+            postings = []
+            for pos in range(len(needle) - _SEARCH_GRAM_SIZE + 1):
+                posting = self._grams.get(needle[pos:pos + _SEARCH_GRAM_SIZE])
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = sorted(set.intersection(*postings))
+        matches = []
+        for idx in candidates:
+            if any(needle in key for key in self._keys[idx]):
+                matches.append(idx)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def ranked(self, query: str, limit: int = 25) -> list[int]:
+        needle = query.strip().casefold()
+        if not needle:
+            return list(range(min(limit, self.size)))
+        ranked = []
+        seen = set()
+        tiers = (self.exact, self.prefix, self.token_prefix, self.substring)
+        for tier in tiers:
+            # Each tier may overlap earlier ones, so over-fetch by what is already ranked.
+            for idx in tier(needle, limit + len(ranked)):
+                if idx not in seen:
+                    seen.add(idx)
+                    ranked.append(idx)
+                    if len(ranked) >= limit:
+                        return ranked
+        return ranked
+
+
+def _display_name(str_info: str) -> str:
+    line = str_info.strip()
+    if line.startswith(">"):
+        line = line[1:].strip()
+    return line.split(" | ", 1)[0].strip()
+
+
+def _server_search_keys(server: DASAB_SERVER_INFO):
+    keys = [server.id, server.name]
+    if server.ip and server.port:
+        keys.append(f"{server.ip}:{server.port}")
+    cfg = server.config
+    if isinstance(cfg, DASAB_SERVER_CONFIG):
+        keys.extend((cfg.server_id, cfg.server_profile, cfg.server_name))
+        if cfg.server_ip and cfg.server_port:
+            keys.append(f"{cfg.server_ip}:{cfg.server_port}")
+    return [key for key in keys if key]
+
+
+@dataclass(frozen=True)
+class DASAB_SERVER_SNAPSHOT:
+    servers: tuple[DASAB_SERVER_INFO, ...] = ()
+    search_keys: tuple[str, ...] = ()
+    names: tuple[str, ...] = ()
+    name_search_keys: tuple[tuple[str, ...], ...] = ()
+    created_at: float = 0.0
+
+    @classmethod
+    def from_infos(cls, infos, created_at: float = 0.0):
+        servers = tuple(info for info in infos if isinstance(info, DASAB_SERVER_INFO) and info.str_info)
+        name_keys = {}
+        for server in servers:
+            name = _display_name(server.str_info)
+            if not name:
+                continue
+            keys = name_keys.setdefault(name, [name])
+            keys.extend(_server_search_keys(server))
+        return cls(
+            servers=servers,
+            search_keys=tuple(server.str_info.casefold() for server in servers),
+            names=tuple(name_keys),
+            name_search_keys=tuple(tuple(keys) for keys in name_keys.values()),
+            created_at=created_at,
+        )
+
+    def __bool__(self):
+        return bool(self.servers)
+
+    def filter(self, server_filter: str = "") -> tuple[DASAB_SERVER_INFO, ...]:
+        if not server_filter:
+            return self.servers
+        needle = server_filter.casefold()
+        return tuple(
+            server
+            for server, key in zip(self.servers, self.search_keys)
+            if needle in key
+        )
+
+    def render(self, server_filter: str = "") -> str:
+        if not server_filter:
+            return self.text
+        return "".join(server.str_info + "\n" for server in self.filter(server_filter))
+
+    def autocomplete(self, current: str, limit: int = 25) -> list[str]:
+        return [self.names[idx] for idx in self.search_index.ranked(current, limit)]
+
+    @cached_property
+    def search_index(self) -> DASAB_SEARCH_INDEX:
+        return DASAB_SEARCH_INDEX(self.name_search_keys)
+
+    @cached_property
+    def text(self) -> str:
+        return "".join(server.str_info + "\n" for server in self.servers)
@@ -0,0 +1,318 @@
+import json
+import re
+from functools import lru_cache
+
+PLACEHOLDER_PATTERN = re.compile(
+    r"\{\$([A-Za-z_][A-Za-z0-9_]*)\}"
+    r"|\$\{([A-Za-z_][A-Za-z0-9_]*)\}"
+    r"|\$([A-Za-z_][A-Za-z0-9_]*)"
+    r"|\{([A-Za-z_][A-Za-z0-9_]*)\}"
+)
+MISSING = object()
+TEMPLATE_CACHE_SIZE = 512
+
+
+class CompiledTemplate:
+    """Template split once into literal text and placeholder names ({$x}, ${x}, $x and {x})."""
+
+    __slots__ = ("text", "tokens", "_parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        parts = []
+        tokens = []
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            if match.start() > pos:
+                parts.append((text[pos:match.start()], None))
+            token = match.group(match.lastindex)
+            parts.append((None, token))
+            if token not in tokens:
+                tokens.append(token)
+            pos = match.end()
+        if pos < len(text):
+            parts.append((text[pos:], None))
+        self._parts = tuple(parts)
+        self.tokens = tuple(tokens)
+
+    def render(self, context: dict) -> str:
+        if not self.tokens:
+            return self.text
+        chunks = []
+        for literal, token in self._parts:
+            if token is None:
+                chunks.append(literal)
+            else:
+                value = context.get(token)
+                chunks.append("" if value is None else str(value))
+        return "".join(chunks)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(text: str) -> CompiledTemplate:
+    return CompiledTemplate(text)
+
+
+def _compile_payload_node(node):
+    if isinstance(node, str):
+        template = compile_template(node)
+        return template if template.tokens else node
+    if isinstance(node, dict):
+        return {_compile_payload_node(key): _compile_payload_node(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_compile_payload_node(item) for item in node]
+    return node
+
+
+def _fill_payload_node(node, context: dict):
+    if isinstance(node, CompiledTemplate):
+        return node.render(context)
+    if isinstance(node, dict):
+        return {_fill_payload_node(key, context): _fill_payload_node(value, context) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_fill_payload_node(item, context) for item in node]
+    return node
+
+
+def _payload_has_slots(node):
+    if isinstance(node, CompiledTemplate):
+        return True
+    if isinstance(node, dict):
+        return any(_payload_has_slots(key) or _payload_has_slots(value) for key, value in node.items())
+    if isinstance(node, list):
+        return any(_payload_has_slots(item) for item in node)
+    return False
+
+
+class PayloadTemplate:
+    """A backend_req Payload parsed once; JSON payloads keep placeholder slots only at leaf strings."""
+
+    __slots__ = ("tree", "text", "_has_slots")
+
+    def __init__(self, payload):
+        self.tree = None
+        self.text = None
+        self._has_slots = False
+        if not isinstance(payload, str):
+            self.tree = payload
+            return
+
+        stripped = payload.strip()
+        if stripped.startswith("{") or stripped.startswith("["):
+            for candidate in (stripped, stripped.replace("'", '"')):
+                try:
+                    parsed = json.loads(candidate)
+                except ValueError:
+                    continue
+                self.tree = _compile_payload_node(parsed)
+                self._has_slots = _payload_has_slots(self.tree)
+                return
+        # Not JSON until placeholders are filled in (e.g. unquoted $server_port); render as text per request.
+        self.text = compile_template(payload)
+
+    @classmethod
+    def from_config(cls, payload):
+        if payload is None or isinstance(payload, cls):
+            return payload
+        if isinstance(payload, str):
+            return compile_payload_template(payload)
+        return cls(payload)
+
+    def render(self, context: dict):
+        if self.text is None:
+            return _fill_payload_node(self.tree, context) if self._has_slots else self.tree
+        rendered = self.text.render(context).strip()
+        if rendered == "":
+            return None
+        if rendered.startswith("{") or rendered.startswith("["):
+            try:
+                return json.loads(rendered)
+            except ValueError:
+                try:
+                    return json.loads(rendered.replace("'", '"'))
+                except ValueError:
+                    return rendered
+        return rendered
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_payload_template(text: str) -> PayloadTemplate:
+    return PayloadTemplate(text)
+
+
+def normalize_lookup_segment(value):
+    return str(value).strip().casefold()
+
+
+def normalize_lookup_path(value):
+    if value is None:
+        return ""
+    parts = [part for part in str(value).strip().split(".") if part.strip()]
+    return ".".join(normalize_lookup_segment(part) for part in parts)
+
+
+def compile_field_candidates(placeholder: str, mapping):
+    candidates = list(mapping) if isinstance(mapping, list) else [mapping]
+    if not any(str(candidate).strip() == placeholder for candidate in candidates):
+        candidates.append(placeholder)
+    compiled = []
+    for candidate in candidates:
+        if candidate is None:
+            continue
+        candidate_text = str(candidate).strip()
+        if not candidate_text:
+            continue
+        compiled.append((normalize_lookup_path(candidate_text), normalize_lookup_segment(candidate_text)))
+    return tuple(compiled)
+
+
+class PayloadLookup:
+    """Resolves normalized paths/keys on demand, walking only what is asked for and memoizing per payload."""
+
+    __slots__ = ("root", "_folded", "_paths", "_keys")
+
+    def __init__(self, root):
+        self.root = root
+        self._folded = {}
+        self._paths = {}
+        self._keys = None
+
+    def _folded_keys(self, node: dict):
+        folded = self._folded.get(id(node))
+        if folded is None:
+            folded = {}
+            for key, value in node.items():
+                if value is not None:
+                    folded.setdefault(normalize_lookup_segment(key), value)
+            self._folded[id(node)] = folded
+        return folded
+
+    def by_path(self, normalized_path: str):
+        if not normalized_path:
+            return MISSING
+        value = self._paths.get(normalized_path, None)
+        if value is not None:
+            return value
+        node = self.root
+        for segment in normalized_path.split("."):
+            if isinstance(node, dict):
+                node = self._folded_keys(node).get(segment, MISSING)
+            elif isinstance(node, list) and segment.isdigit() and str(int(segment)) == segment:
+                idx = int(segment)
+                node = node[idx] if idx < len(node) else MISSING
+            else:
+                node = MISSING
+            if node is MISSING or node is None:
+                node = MISSING
+                break
+        self._paths[normalized_path] = node
+        return node
+
+    def by_key(self, normalized_key: str):
+        if self._keys is None:
+            # Only built when a path lookup misses; one walk then serves every key fallback for this payload.
+            self._keys = {}
+            self._index_keys(self.root)
+        return self._keys.get(normalized_key, MISSING)
+
+    def _index_keys(self, node):
+        if isinstance(node, dict):
+            keys = self._keys
+            for key, value in node.items():
+                if value is None:
+                    continue
+                keys.setdefault(key.strip().casefold() if isinstance(key, str) else normalize_lookup_segment(key), value)
+                if isinstance(value, (dict, list)):
+                    self._index_keys(value)
+        elif isinstance(node, list):
+            for item in node:
+                if isinstance(item, (dict, list)):
+                    self._index_keys(item)
+
+    def resolve(self, candidates):
+        for normalized_path, normalized_key in candidates:
+            value = self.by_path(normalized_path)
+            if value is not MISSING:
+                return value
+            value = self.by_key(normalized_key)
+            if value is not MISSING:
+                return value
+        return MISSING
+
+
+class _ItemRenderPlan:
+    __slots__ = ("template", "fields")
+
+    def __init__(self, template: CompiledTemplate, fields: dict):
+        self.template = template
+        self.fields = tuple(
+            (placeholder, compile_field_candidates(placeholder, fields.get(placeholder, placeholder)))
+            for placeholder in template.tokens
+        )
+
+    def render(self, payload):
+        if not self.fields:
+            return self.template.text
+        lookup = PayloadLookup(payload)
+        context = {}
+        for placeholder, candidates in self.fields:
+            value = lookup.resolve(candidates)
+            if value is MISSING or value is None:
+                context[placeholder] = ""
+            elif isinstance(value, (dict, list)):
+                context[placeholder] = json.dumps(value, ensure_ascii=False)
+            else:
+                context[placeholder] = value
+        return self.template.render(context)
+
+
+class ResponseRenderPlan:
+    """A command's response_processing block, compiled once at config load."""
+
+    __slots__ = ("item", "list_item", "join_with")
+
+    def __init__(self, response_processing: dict):
+        fields = response_processing.get("fields", {})
+        if not isinstance(fields, dict):
+            fields = {}
+        join_with = response_processing.get("join_with", "\n")
+        self.join_with = join_with if isinstance(join_with, str) else "\n"
+
+        template = response_processing.get("template")
+        template_text = template.strip() if isinstance(template, str) else ""
+        self.item = _ItemRenderPlan(CompiledTemplate(template_text), fields) if template_text else None
+
+        item_template = response_processing.get("item_template")
+        if isinstance(item_template, str) and item_template.strip():
+            self.list_item = _ItemRenderPlan(CompiledTemplate(item_template.strip()), fields)
+        else:
+            self.list_item = self.item
+
+    @classmethod
+    def from_config(cls, response_processing):
+        if isinstance(response_processing, cls):
+            return response_processing
+        if not isinstance(response_processing, dict):
+            return None
+        return cls(response_processing)
+
+    def format_payload(self, payload):
+        if isinstance(payload, list):
+            if self.list_item is None:
+                return None
+            lines = []
+            for item in payload:
+                if not isinstance(item, (dict, list)):
+                    continue
+                line = self.list_item.render(item)
+                if line is not None and line.strip():
+                    lines.append(line)
+            if lines:
+                return self.join_with.join(lines)
+            return None
+
+        if isinstance(payload, dict) and self.item is not None:
+            line = self.item.render(payload)
+            if line is not None and line.strip():
+                return line
+        return None
@@ -1,7 +1,13 @@
+import heapq
 import json
 import os
+import sqlite3
+import threading
+import time
 from dataclasses import dataclass, field
 
+from DASAB_templates import PayloadTemplate, ResponseRenderPlan
+
 
 def _strip_json_comments(text: str) -> str:
     result = []
@@ -147,15 +153,21 @@ class DiscordControlConfig:
     _failure_cooldown: object = None
     _allowed_guild_ids: object = None
     _allowed_channel_ids: object = None
+    _window_seconds: object = None
+    _priority: object = None
 
     _count_int: int = field(init=False, default=1)
     _success_cooldown_float: float = field(init=False, default=0.0)
     _failure_cooldown_float: float = field(init=False, default=0.0)
     _allowed_guild_ids_list: list[int] = field(init=False, default_factory=list)
     _allowed_channel_ids_list: list[int] = field(init=False, default_factory=list)
+    _window_seconds_float: float = field(init=False, default=0.0)
+    _priority_int: int = field(init=False, default=0)
 
     def __post_init__(self):
-        self._count_int = _parse_int(self._count, 1, "_count")
+        self._count_int = max(1, _parse_int(self._count, 1, "_count"))
+        self._window_seconds_float = max(0.0, _parse_float(self._window_seconds, 0.0, "_window_seconds"))
+        self._priority_int = _parse_int(self._priority, 0, "_priority")
         self._success_cooldown_float = _parse_float(self._success_cooldown, 0.0, "_success_cooldown")
         self._failure_cooldown_float = _parse_float(self._failure_cooldown, 0.0, "_failure_cooldown")
         self._allowed_guild_ids_list = _parse_id_list(self._allowed_guild_ids, "_allowed_guild_ids")
@@ -172,8 +184,103 @@ class DiscordControlConfig:
             data.get("failure_cooldown"),
             data.get("allowed_guild_ids"),
             data.get("allowed_channel_ids"),
+            data.get("cmd_window_seconds"),
+            data.get("priority"),
+        )
+
+
+def control_rank(control):
+    success_cd = getattr(control, "_success_cooldown_float", 0.0)
+    failure_cd = getattr(control, "_failure_cooldown_float", 0.0)
+    lowest = min(success_cd, failure_cd)
+    return (lowest, success_cd, failure_cd)
+
+
+@dataclass(frozen=True, slots=True)
+class DiscordAccessRule:
+    control: DiscordControlConfig
+    order: int
+    guild_ids: frozenset[int]
+    channel_ids: frozenset[int]
+
+    def allows(self, guild_id, channel_id) -> bool:
+        if self.guild_ids and guild_id not in self.guild_ids:
+            return False
+        if self.channel_ids and channel_id not in self.channel_ids:
+            return False
+        return True
+
+
+@dataclass(frozen=True, slots=True)
+class DiscordAccessTable:
+    """A command's discord_controls compiled for lookup by member role; rules are kept sorted by control_rank."""
+
+    rules: tuple[DiscordAccessRule, ...] = ()
+    open_rules: frozenset[int] = frozenset()
+    rules_by_role_id: dict = field(default_factory=dict)
+    rules_by_role_name: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_controls(cls, controls):
+        ranked = sorted(enumerate(controls), key=lambda item: (control_rank(item[1]), item[0]))
+        rules = []
+        open_rules = set()
+        by_role_id = {}
+        by_role_name = {}
+        for position, (order, control) in enumerate(ranked):
+            rules.append(
+                DiscordAccessRule(
+                    control,
+                    order,
+                    frozenset(control._allowed_guild_ids_list),
+                    frozenset(control._allowed_channel_ids_list),
+                )
+            )
+            required_role = str(control._role or "").strip()
+            if not required_role:
+                open_rules.add(position)
+            elif required_role.isdigit():
+                by_role_id.setdefault(int(required_role), set()).add(position)
+            else:
+                by_role_name.setdefault(required_role.casefold(), set()).add(position)
+        return cls(
+            tuple(rules),
+            frozenset(open_rules),
+            {key: frozenset(value) for key, value in by_role_id.items()},
+            {key: frozenset(value) for key, value in by_role_name.items()},
         )
 
+    def __bool__(self):
+        return bool(self.rules)
+
+    def matching_positions(self, member_roles) -> set[int]:
+        matched = set(self.open_rules)
+        if not member_roles:
+            return matched
+        if self.rules_by_role_id:
+            for role in member_roles:
+                positions = self.rules_by_role_id.get(getattr(role, "id", None))
+                if positions:
+                    matched |= positions
+        if self.rules_by_role_name:
+            for role in member_roles:
+                positions = self.rules_by_role_name.get(str(getattr(role, "name", "")).casefold())
+                if positions:
+                    matched |= positions
+        return matched
+
+    def resolve(self, member_roles, guild_id, channel_id):
+        """Returns (selected control, first role-matched control); both None when no control matches the roles."""
+        matched = self.matching_positions(member_roles)
+        if not matched:
+            return None, None
+        for position in sorted(matched):
+            rule = self.rules[position]
+            if rule.allows(guild_id, channel_id):
+                return rule.control, rule.control
+        first = min((self.rules[position] for position in matched), key=lambda rule: rule.order)
+        return None, first.control
+
 
 @dataclass
 class DiscordCommadConfig:
@@ -190,6 +297,11 @@ class DiscordCommadConfig:
     _require_single_match: object = None
     _arguments: object = None
     _discord_controls: object = None
+    _max_parallel: object = None
+    _deadline_seconds: object = None
+    _invalidates_cache: object = None
+    _window_seconds: object = None
+    _priority: object = None
 
     _count_int: int = field(init=False, default=1)
     _success_cooldown_float: float = field(init=False, default=0.0)
@@ -198,24 +310,38 @@ class DiscordCommadConfig:
     _allowed_channel_ids_list: list[int] = field(init=False, default_factory=list)
     _backend_req_list: list[dict] = field(init=False, default_factory=list)
     _response_processing_dict: dict = field(init=False, default_factory=dict)
+    _response_processing_plan: ResponseRenderPlan | None = field(init=False, default=None)
     _require_single_match_bool: bool = field(init=False, default=True)
     _arguments_dict: dict = field(init=False, default_factory=dict)
     _controls_list: list[DiscordControlConfig] = field(init=False, default_factory=list)
+    _access_table: DiscordAccessTable = field(init=False, default_factory=DiscordAccessTable)
+    _max_parallel_int: int = field(init=False, default=1)
+    _deadline_seconds_float: float = field(init=False, default=0.0)
+    _invalidates_cache_bool: bool = field(init=False, default=False)
+    _window_seconds_float: float = field(init=False, default=0.0)
+    _priority_int: int = field(init=False, default=0)
 
     def __post_init__(self):
-        self._count_int = _parse_int(self._count, 1, "_count")
+        self._count_int = max(1, _parse_int(self._count, 1, "_count"))
+        self._window_seconds_float = max(0.0, _parse_float(self._window_seconds, 0.0, "_window_seconds"))
+        self._priority_int = _parse_int(self._priority, 0, "_priority")
         self._success_cooldown_float = _parse_float(self._success_cooldown, 0.0, "_success_cooldown")
         self._failure_cooldown_float = _parse_float(self._failure_cooldown, 0.0, "_failure_cooldown")
         self._allowed_guild_ids_list = _parse_id_list(self._allowed_guild_ids, "_allowed_guild_ids")
         self._allowed_channel_ids_list = _parse_id_list(self._allowed_channel_ids, "_allowed_channel_ids")
         if isinstance(self._backend_req, list):
-            self._backend_req_list = [item for item in self._backend_req if isinstance(item, dict)]
+            self._backend_req_list = [
+                dict(item, _payload_template=PayloadTemplate.from_config(item.get("Payload")))
+                for item in self._backend_req
+                if isinstance(item, dict)
+            ]
         else:
             self._backend_req_list = []
         if isinstance(self._response_processing, dict):
             self._response_processing_dict = dict(self._response_processing)
         else:
             self._response_processing_dict = {}
+        self._response_processing_plan = ResponseRenderPlan.from_config(self._response_processing_dict or None)
         self._require_single_match_bool = _parse_bool(
             self._require_single_match,
             True,
@@ -225,6 +351,9 @@ class DiscordCommadConfig:
             self._arguments_dict = dict(self._arguments)
         else:
             self._arguments_dict = {}
+        self._max_parallel_int = max(1, _parse_int(self._max_parallel, 1, "_max_parallel"))
+        self._deadline_seconds_float = max(0.0, _parse_float(self._deadline_seconds, 0.0, "_deadline_seconds"))
+        self._invalidates_cache_bool = _parse_bool(self._invalidates_cache, False, "_invalidates_cache")
 
         self._controls_list = []
         if isinstance(self._discord_controls, list):
@@ -242,9 +371,13 @@ class DiscordCommadConfig:
                     self._failure_cooldown,
                     self._allowed_guild_ids,
                     self._allowed_channel_ids,
+                    self._window_seconds,
+                    self._priority,
                 )
             )
 
+        self._access_table = DiscordAccessTable.from_controls(self._controls_list)
+
         # Keep legacy fields mapped to first control for backward compatibility.
         primary = self._controls_list[0]
         self._role = primary._role
@@ -253,6 +386,8 @@ class DiscordCommadConfig:
         self._failure_cooldown_float = primary._failure_cooldown_float
         self._allowed_guild_ids_list = primary._allowed_guild_ids_list
         self._allowed_channel_ids_list = primary._allowed_channel_ids_list
+        self._window_seconds_float = primary._window_seconds_float
+        self._priority_int = primary._priority_int
 
 class CommandConfigs:
     def __init__(self):
@@ -275,6 +410,8 @@ class CommandConfigs:
                     "failure_cooldown",
                     "allowed_guild_ids",
                     "allowed_channel_ids",
+                    "cmd_window_seconds",
+                    "priority",
                 )
             )
 
@@ -304,6 +441,11 @@ class CommandConfigs:
                 command.get("require_single_match"),
                 command.get("arguments"),
                 discord_controls,
+                command.get("max_parallel"),
+                command.get("deadline_seconds"),
+                command.get("invalidates_cache"),
+                command.get("cmd_window_seconds"),
+                command.get("priority"),
             )
             self.cmd_list.append(cmd1_config)
             
@@ -334,9 +476,243 @@ class CommandConfigs:
             return {"commands": []}
 
 
-class CooldownManager:
+COOLDOWN_EVICT_BATCH = 64
+COOLDOWN_DB_ENV = "DASAB_COOLDOWN_DB"
+COOLDOWN_DB_FLUSH_SECONDS = 0.5
+COOLDOWN_DB_PRUNE_SECONDS = 300
+COOLDOWN_DB_BUSY_TIMEOUT_SECONDS = 5
+
+
+class SqliteCooldownBackend:
+    """Cooldowns shared through a local SQLite (WAL) file; a background thread flushes buffered writes and mirrors unexpired rows back into memory."""
+
+    def __init__(self, path: str, flush_seconds: float = COOLDOWN_DB_FLUSH_SECONDS):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._last_prune = 0.0
+        self._writer = self._connect()
+        self._mirror = self._load_unexpired(time.time())
+        self._thread = threading.Thread(target=self._run, name="DASAB-cooldown-db", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=COOLDOWN_DB_BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cooldowns ("
+            " user_id INTEGER NOT NULL,"
+            " command_key TEXT NOT NULL,"
+            " until REAL NOT NULL,"
+            " PRIMARY KEY (user_id, command_key)"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cooldowns_until ON cooldowns (until)")
+        return conn
+
+    def _load_unexpired(self, now: float) -> dict:
+        rows = self._writer.execute("SELECT user_id, command_key, until FROM cooldowns WHERE until > ?", (now,))
+        return {(user_id, command_key): until for user_id, command_key, until in rows}
+
+    def remaining(self, user_id: int, command_key: str) -> float:
+        # Stored times are wall-clock (time.time()) so they mean the same thing to every process and after a restart.
+        # Answered from memory only; the writer thread refreshes the mirror from the file on every flush.
+        key = (user_id, command_key)
+        with self._lock:
+            until = self._pending.get(key)
+            if until is None:
+                until = self._mirror.get(key, 0.0)
+        remaining = until - time.time()
+        return remaining if remaining > 0 else 0.0
+
+    def store(self, user_id: int, command_key: str, seconds: float) -> None:
+        until = time.time() + seconds if seconds > 0 else 0.0
+        with self._lock:
+            self._pending[(user_id, command_key)] = until
+
+    def flush(self) -> None:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            # Keep these visible to remaining() while they are being written.
+            for key, until in pending.items():
+                if until > 0:
+                    self._mirror[key] = until
+                else:
+                    self._mirror.pop(key, None)
+        now = time.time()
+        try:
+            if pending:
+                self._writer.execute("BEGIN IMMEDIATE")
+                try:
+                    self._writer.executemany(
+                        "INSERT INTO cooldowns (user_id, command_key, until) VALUES (?, ?, ?)"
+                        " ON CONFLICT (user_id, command_key) DO UPDATE SET until = excluded.until",
+                        [(user_id, command_key, until) for (user_id, command_key), until in pending.items() if until > now],
+                    )
+                    self._writer.executemany(
+                        "DELETE FROM cooldowns WHERE user_id = ? AND command_key = ?",
+                        [key for key, until in pending.items() if until <= now],
+                    )
+                    self._writer.execute("COMMIT")
+                except Exception:
+                    self._writer.execute("ROLLBACK")
+                    raise
+            if now - self._last_prune >= COOLDOWN_DB_PRUNE_SECONDS:
+                self._writer.execute("DELETE FROM cooldowns WHERE until <= ?", (now,))
+                self._last_prune = now
+            mirror = self._load_unexpired(now)
+            with self._lock:
+                self._mirror = mirror
+        except sqlite3.Error as e:
+            print(f"Error writing cooldown store '{self.path}': {e}")
+            with self._lock:
+                for key, until in pending.items():
+                    self._pending.setdefault(key, until)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(COOLDOWN_DB_BUSY_TIMEOUT_SECONDS)
+        self.flush()
+        self._writer.close()
+
+
+class CommandRateLimiter:
+    """Per (user, command key) limits from cmd_count: in-flight requests, plus a token bucket when cmd_window_seconds is set."""
+
     def __init__(self):
+        self._buckets = {}
+        self._full_heap = []
+        self._in_flight = {}
+        self.in_flight_total = 0
+        self.peak_in_flight = 0
+        self.allowed = 0
+        self.rate_limited = 0
+        self.concurrency_limited = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._buckets)
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rate_limited": self.rate_limited,
+            "concurrency_limited": self.concurrency_limited,
+            "in_flight": self.in_flight_total,
+            "peak_in_flight": self.peak_in_flight,
+            "buckets": self.size,
+        }
+
+    def in_flight(self, user_id: int, command_key: str) -> int:
+        return self._in_flight.get((user_id, command_key), 0)
+
+    def acquire(self, user_id: int, command_key: str, control, now: float) -> tuple[bool, float]:
+        """Returns (admitted, retry_after); a refusal with retry_after 0 means the in-flight cap was hit."""
+        limit = max(1, getattr(control, "_count_int", 1))
+        window = getattr(control, "_window_seconds_float", 0.0)
+        key = (user_id, command_key)
+        running = self._in_flight.get(key, 0)
+        if running >= limit:
+            self.concurrency_limited += 1
+            return False, 0.0
+
+        if window > 0:
+            rate = limit / window
+            tokens, updated, _ = self._buckets.get(key, (float(limit), now, now))
+            tokens = min(float(limit), tokens + (now - updated) * rate)
+            if tokens < 1.0:
+                self.rate_limited += 1
+                return False, (1.0 - tokens) / rate
+            tokens -= 1.0
+            full_at = now + (limit - tokens) / rate
+            self._buckets[key] = (tokens, now, full_at)
+            heapq.heappush(self._full_heap, (full_at, user_id, command_key))
+            self.evict_expired(now)
+
+        self._in_flight[key] = running + 1
+        self.in_flight_total += 1
+        if self.in_flight_total > self.peak_in_flight:
+            self.peak_in_flight = self.in_flight_total
+        self.allowed += 1
+        return True, 0.0
+
+    def release(self, user_id: int, command_key: str) -> None:
+        key = (user_id, command_key)
+        running = self._in_flight.get(key, 0)
+        if running <= 0:
+            return
+        if running == 1:
+            del self._in_flight[key]
+        else:
+            self._in_flight[key] = running - 1
+        self.in_flight_total -= 1
+
+    def evict_expired(self, now: float, limit: int = COOLDOWN_EVICT_BATCH) -> int:
+        # A bucket that has refilled is the same as no bucket; drop it like a lapsed cooldown.
+        heap = self._full_heap
+        evicted = 0
+        while heap and heap[0][0] <= now and (limit <= 0 or evicted < limit):
+            full_at, user_id, command_key = heapq.heappop(heap)
+            key = (user_id, command_key)
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket[2] <= now:
+                del self._buckets[key]
+                evicted += 1
+        if len(heap) > 2 * len(self._buckets) + COOLDOWN_EVICT_BATCH:
+            self._full_heap = [(bucket[2], user_id, command_key) for (user_id, command_key), bucket in self._buckets.items()]
+            heapq.heapify(self._full_heap)
+        return evicted
+
+
+class CooldownManager:
+    """Per-user cooldowns; lapsed entries are evicted through an expiry heap so the store stays bounded."""
+
+    def __init__(self, backend=None):
         self._cooldown_until = {}
+        self._expiry_heap = []
+        self.evictions = 0
+        self.backend = backend
+
+    @classmethod
+    def from_env(cls):
+        path = os.getenv(COOLDOWN_DB_ENV, "").strip()
+        if not path:
+            return cls()
+        try:
+            return cls(SqliteCooldownBackend(path))
+        except sqlite3.Error as e:
+            print(f"Error opening cooldown store '{path}', using in-memory cooldowns: {e}")
+            return cls()
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._cooldown_until)
+
+    def stats(self) -> dict:
+        return {"size": self.size, "heap": len(self._expiry_heap), "evictions": self.evictions}
 
     def get_command_key(self, config, fallback_name: str, control=None) -> str:
         if config is not None and getattr(config, "_name", ""):
@@ -358,12 +734,47 @@ class CooldownManager:
         return seconds if seconds > 0 else 0.0
 
     def get_remaining(self, user_id: int, command_key: str, now: float) -> float:
-        cooldown_until = self._cooldown_until.get((user_id, command_key), 0.0)
+        key = (user_id, command_key)
+        cooldown_until = self._cooldown_until.get(key, 0.0)
         remaining = cooldown_until - now
-        return remaining if remaining > 0 else 0.0
+        if remaining > 0:
+            return remaining
+        if cooldown_until:
+            del self._cooldown_until[key]
+            self.evictions += 1
+        if self.backend is not None:
+            # Local miss: another bot process (or the run before a restart) may have set it.
+            remaining = self.backend.remaining(user_id, command_key)
+            if remaining > 0:
+                self._remember(user_id, command_key, now + remaining)
+                return remaining
+        return 0.0
 
     def set_cooldown(self, user_id: int, command_key: str, seconds: float, now: float) -> None:
         if seconds > 0:
-            self._cooldown_until[(user_id, command_key)] = now + seconds
+            self._remember(user_id, command_key, now + seconds)
         else:
             self._cooldown_until.pop((user_id, command_key), None)
+        if self.backend is not None:
+            self.backend.store(user_id, command_key, seconds)
+        self.evict_expired(now)
+
+    def _remember(self, user_id: int, command_key: str, cooldown_until: float) -> None:
+        self._cooldown_until[(user_id, command_key)] = cooldown_until
+        heapq.heappush(self._expiry_heap, (cooldown_until, user_id, command_key))
+
+    def evict_expired(self, now: float, limit: int = COOLDOWN_EVICT_BATCH) -> int:
+        # Heap entries are never updated in place; one whose time no longer matches the dict is a stale leftover.
+        heap = self._expiry_heap
+        evicted = 0
+        while heap and heap[0][0] <= now and (limit <= 0 or evicted < limit):
+            cooldown_until, user_id, command_key = heapq.heappop(heap)
+            key = (user_id, command_key)
+            if self._cooldown_until.get(key) == cooldown_until:
+                del self._cooldown_until[key]
+                self.evictions += 1
+                evicted += 1
+        if len(heap) > 2 * len(self._cooldown_until) + COOLDOWN_EVICT_BATCH:
+            self._expiry_heap = [(until, user_id, command_key) for (user_id, command_key), until in self._cooldown_until.items()]
+            heapq.heapify(self._expiry_heap)
+        return evicted